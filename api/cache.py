@@ -0,0 +1,86 @@
+"""
+In-process TTL response cache for read-mostly endpoints
+"""
+
+import psycopg2
+from collections import OrderedDict
+from functools import wraps
+from datetime import datetime, timezone
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Past Olympic dates are effectively immutable; today and future dates still change
+LONG_TTL = 3600
+SHORT_TTL = 30
+# Endpoints without a date parameter (e.g. /api/dates)
+DEFAULT_TTL = 300
+
+# Entries kept at most (least recently used evicted first): every distinct valid
+# date adds a key, so the cache must not grow with whatever dates clients ask for
+MAX_ENTRIES = 512
+# Expired entries are kept this long for serving stale on a database outage,
+# then dropped on the next write
+STALE_GRACE = 3600
+
+# key -> (expires_at, value), in least- to most-recently-used order
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+def ttl_for_date(date):
+    """Long TTL for dates before today (UTC), short TTL for today and later"""
+    today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    return LONG_TTL if date < today else SHORT_TTL
+
+
+def clear_cache():
+    """Drop all cached responses"""
+    with _lock:
+        _cache.clear()
+
+
+def _evict(now):
+    """Drop entries past their stale grace, then LRU entries over MAX_ENTRIES (hold _lock)"""
+    for key in [k for k, (expires_at, _) in _cache.items() if expires_at + STALE_GRACE <= now]:
+        del _cache[key]
+    while len(_cache) > MAX_ENTRIES:
+        _cache.popitem(last=False)
+
+
+def cached_response(func):
+    """
+    Cache a handler's return value keyed by (handler, arguments).
+    On a database OperationalError, serve the last cached value even if expired.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+
+        with _lock:
+            entry = _cache.get(key)
+            if entry:
+                _cache.move_to_end(key)
+        if entry and entry[0] > now:
+            return entry[1]
+
+        try:
+            value = func(*args, **kwargs)
+        except psycopg2.OperationalError as e:
+            if entry:
+                logger.warning(f"Database unavailable, serving stale {func.__name__}: {e}")
+                return entry[1]
+            raise
+
+        date = kwargs.get('date')
+        ttl = ttl_for_date(date) if date else DEFAULT_TTL
+        with _lock:
+            _cache[key] = (now + ttl, value)
+            _cache.move_to_end(key)
+            _evict(now)
+        return value
+
+    return wrapper
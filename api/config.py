@@ -0,0 +1,35 @@
+"""
+API configuration, read from the environment (and .env) once at import
+"""
+
+from dataclasses import dataclass
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+
+
+@dataclass(frozen=True, slots=True)
+class DBConfig:
+    host: str
+    port: int
+    database: str
+    user: str
+    password: str
+    # Per worker process; workers x pool_max must stay under max_connections
+    pool_max: int
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            host=os.getenv('DB_HOST', '127.0.0.1'),
+            port=int(os.getenv('DB_PORT', '5432')),
+            database=os.getenv('DB_NAME', 'olympics_tv'),
+            user=os.getenv('DB_USER'),
+            password=os.getenv('DB_PASSWORD'),
+            pool_max=int(os.getenv('DB_POOL_MAX', '20')),
+        )
+
+
+DB_CONFIG = DBConfig.from_env()
+ENVIRONMENT = os.getenv('ENVIRONMENT', 'development')
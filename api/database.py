@@ -4,26 +4,48 @@ Database connection and pooling
 
 import psycopg2
 from psycopg2 import pool
+from psycopg2.extras import RealDictCursor
+from uuid import uuid4
+import itertools
 import logging
-import os
+import re
+import threading
+
+from api.config import DB_CONFIG
 
 logger = logging.getLogger(__name__)
 
 # Database connection pool
 connection_pool = None
+POOL_MINCONN = 5
+POOL_MAXCONN = max(DB_CONFIG.pool_max, POOL_MINCONN)
+
+# ThreadedConnectionPool raises PoolError when exhausted instead of waiting, while
+# FastAPI's sync-handler threadpool is larger than the pool; make callers queue
+_pool_slots = threading.BoundedSemaphore(POOL_MAXCONN)
+
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """Connection that remembers which server-side prepared statements it holds"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
 
 
 def init_connection_pool():
     """Initialize database connection pool"""
     global connection_pool
     try:
-        connection_pool = psycopg2.pool.SimpleConnectionPool(
-            1, 20,
-            host=os.getenv('DB_HOST', '127.0.0.1'),
-            port=int(os.getenv('DB_PORT', '5432')),
-            database=os.getenv('DB_NAME', 'olympics_tv'),
-            user=os.getenv('DB_USER'),
-            password=os.getenv('DB_PASSWORD')
+        # Threaded pool: FastAPI runs sync handlers on a worker threadpool
+        connection_pool = psycopg2.pool.ThreadedConnectionPool(
+            POOL_MINCONN, POOL_MAXCONN,
+            host=DB_CONFIG.host,
+            port=DB_CONFIG.port,
+            database=DB_CONFIG.database,
+            user=DB_CONFIG.user,
+            password=DB_CONFIG.password,
+            connection_factory=PreparingConnection
         )
         logger.info("Database connection pool initialized")
     except Exception as e:
@@ -32,16 +54,32 @@ def init_connection_pool():
 
 
 def get_connection():
-    """Get a connection from the pool"""
+    """Get a connection from the pool, waiting for a free slot if all are in use"""
     if not connection_pool:
         init_connection_pool()
-    return connection_pool.getconn()
+    _pool_slots.acquire()
+    try:
+        conn = connection_pool.getconn()
+    except Exception:
+        _pool_slots.release()
+        raise
+    # API is read-only: skip per-request transaction bookkeeping
+    if not conn.autocommit:
+        try:
+            conn.set_session(readonly=True, autocommit=True)
+        except Exception:
+            return_connection(conn)
+            raise
+    return conn
 
 
 def return_connection(conn):
-    """Return a connection to the pool"""
+    """Return a connection to the pool (discarding it if the server closed it)"""
     if connection_pool:
-        connection_pool.putconn(conn)
+        try:
+            connection_pool.putconn(conn, close=bool(conn.closed))
+        finally:
+            _pool_slots.release()
 
 
 def close_all_connections():
@@ -50,6 +88,12 @@ def close_all_connections():
         connection_pool.closeall()
 
 
+def _rollback(conn):
+    """Roll back a failed query so the connection goes back to the pool clean"""
+    if not conn.closed:
+        conn.rollback()
+
+
 def execute_query(query, params=None):
     """Execute a query and return results"""
     conn = get_connection()
@@ -61,6 +105,10 @@ def execute_query(query, params=None):
             cursor.execute(query)
         results = cursor.fetchall()
         cursor.close()
+    except Exception:
+        _rollback(conn)
+        raise
+    else:
         return results
     finally:
         return_connection(conn)
@@ -70,24 +118,77 @@ def execute_query_dict(query, params=None):
     """Execute a query and return results as dictionaries"""
     conn = get_connection()
     try:
-        cursor = conn.cursor()
+        # RealDictCursor builds each row's dict in the C extension
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
         if params:
             cursor.execute(query, params)
         else:
             cursor.execute(query)
+        results = cursor.fetchall()
+        cursor.close()
+    except Exception:
+        _rollback(conn)
+        raise
+    else:
+        return results
+    finally:
+        return_connection(conn)
 
-        # Get column names
-        columns = [desc[0] for desc in cursor.description]
 
-        # Fetch results
-        rows = cursor.fetchall()
-        cursor.close()
+def _to_positional(query):
+    """Rewrite psycopg2 %s placeholders as PREPARE-style $1, $2, ..."""
+    counter = itertools.count(1)
+    return re.sub(r'%s', lambda m: f"${next(counter)}", query)
 
-        # Convert to list of dicts
-        results = []
-        for row in rows:
-            results.append(dict(zip(columns, row)))
 
+def execute_prepared_dict(name, query, params=None):
+    """
+    Execute a fixed query as a server-side prepared statement and return dictionaries.
+    The statement is PREPAREd the first time each pooled connection runs it, after
+    which only EXECUTE name(...) is sent and Postgres skips parse/plan.
+    """
+    conn = get_connection()
+    try:
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        if name not in conn.prepared:
+            cursor.execute(f"PREPARE {name} AS {_to_positional(query)}")
+            conn.prepared.add(name)
+        if params:
+            cursor.execute(f"EXECUTE {name}({', '.join(['%s'] * len(params))})", params)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+        results = cursor.fetchall()
+        cursor.close()
+    except Exception:
+        _rollback(conn)
+        raise
+    else:
         return results
     finally:
         return_connection(conn)
+
+
+def execute_query_dict_streaming(query, params=None, itersize=500):
+    """
+    Execute a query on a server-side (named) cursor and yield rows as dictionaries.
+    Rows are fetched from Postgres in batches of itersize instead of all at once.
+    """
+    conn = get_connection()
+    try:
+        # Named cursors need a transaction; the pool hands out autocommit connections
+        conn.autocommit = False
+        cursor = conn.cursor(name=f"stream_{uuid4().hex}", cursor_factory=RealDictCursor)
+        cursor.itersize = itersize
+        cursor.execute(query, params)
+        for row in cursor:
+            yield row
+        cursor.close()
+        conn.commit()
+    except BaseException:
+        # Includes GeneratorExit when the caller stops iterating early
+        _rollback(conn)
+        raise
+    finally:
+        if not conn.closed:
+            conn.autocommit = True
+        return_connection(conn)
@@ -2,20 +2,23 @@
 FastAPI backend for Olympics TV schedule
 """
 
-from dotenv import load_dotenv
-load_dotenv()
-
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime
-from typing import Optional, List, Dict
+from datetime import date as date_type
+from functools import lru_cache
+from typing import Optional
 import logging
-import os
+import re
 
-from api.database import init_connection_pool, close_all_connections, execute_query_dict
+from api.config import ENVIRONMENT
+from api.database import (
+    init_connection_pool, close_all_connections,
+    execute_query_dict, execute_query_dict_streaming, execute_prepared_dict
+)
+from api.cache import cached_response
 from api.models import (
-    ScheduleResponse, Event, Competitor, Broadcast,
-    TVResponse, BroadcastDetail, LinkedEvent, RundownSegment,
+    ScheduleResponse, SearchResponse, Event,
+    TVResponse, BroadcastDetail,
     DatesResponse, DateInfo,
     EuroBroadcast, EuroTVResponse,
     CommentaryItem, CommentaryResponse, ResultSummary
@@ -52,6 +55,78 @@ def shutdown():
     logger.info("API shutdown")
 
 
+# Event columns with competitors and broadcasts aggregated as JSON arrays, so a
+# single round trip returns fully nested events. Callers append WHERE/ORDER BY.
+EVENT_SELECT = """
+    SELECT
+        su.event_unit_code,
+        su.event_unit_name,
+        COALESCE(d.name, 'Unknown') as discipline,
+        COALESCE(e.name, 'Unknown') as event_name,
+        e.gender_code as gender,
+        su.start_time,
+        su.end_time,
+        v.name as venue,
+        su.medal_flag,
+        su.phase_name,
+        su.status,
+        COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'code', c.code,
+                'name', c.name,
+                'noc', c.noc,
+                'competitor_type', c.competitor_type
+            ) ORDER BY uc.start_order)
+            FROM unit_competitors uc
+            JOIN competitors c ON uc.competitor_code = c.code
+            WHERE uc.event_unit_code = su.event_unit_code
+        ), '[]'::jsonb) as competitors,
+        COALESCE((
+            SELECT jsonb_agg(jsonb_build_object(
+                'drupal_id', nb.drupal_id,
+                'title', nb.title,
+                'network', nb.network_name,
+                'start_time', nb.start_time,
+                'end_time', nb.end_time,
+                'day_part', nb.day_part,
+                'summary', nb.summary,
+                'video_url', nb.video_url,
+                'is_replay', COALESCE(nb.is_replay, FALSE)
+            ) ORDER BY nb.start_time)
+            FROM nbc_broadcast_units nbu
+            JOIN nbc_broadcasts nb ON nbu.broadcast_drupal_id = nb.drupal_id
+            WHERE nbu.unit_code = su.event_unit_code
+        ), '[]'::jsonb) as broadcasts
+    FROM schedule_units su
+    LEFT JOIN events e ON su.event_id = e.event_id
+    LEFT JOIN disciplines d ON e.discipline_code = d.code
+    LEFT JOIN venues v ON su.venue_code = v.code
+"""
+
+
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+@lru_cache(maxsize=256)
+def _validate_date(date):
+    """Parse a YYYY-MM-DD path/query date, raising 400 if it is malformed"""
+    if _DATE_RE.fullmatch(date):
+        try:
+            return date_type.fromisoformat(date)
+        except ValueError:
+            pass
+    raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+
+def build_events(events_data):
+    """Build Event models from EVENT_SELECT rows (competitors/broadcasts arrive pre-nested)"""
+    events = []
+    for row in events_data:
+        row['medal_flag'] = bool(row['medal_flag'])
+        events.append(Event(**row))
+    return events
+
+
 @app.get("/health")
 def health_check():
     """Health check endpoint for monitoring"""
@@ -59,45 +134,27 @@ def health_check():
         "status": "healthy",
         "service": "Olympics TV API",
         "version": "1.0.0",
-        "environment": os.getenv("ENVIRONMENT", "development")
+        "environment": ENVIRONMENT
     }
 
 
 @app.get("/api/schedule/{date}", response_model=ScheduleResponse)
+@cached_response
 def get_schedule(date: str):
     """
     Get all Olympic events for a given date with linked NBC broadcasts.
     Format: YYYY-MM-DD
     """
-    # Validate date format
-    try:
-        datetime.strptime(date, '%Y-%m-%d')
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    _validate_date(date)
 
-    # Query Olympic events for the date
-    query = """
-        SELECT
-            su.event_unit_code,
-            su.event_unit_name,
-            d.name as discipline,
-            e.name as event_name,
-            e.gender_code as gender,
-            su.start_time,
-            su.end_time,
-            v.name as venue,
-            su.medal_flag,
-            su.phase_name,
-            su.status
-        FROM schedule_units su
-        LEFT JOIN events e ON su.event_id = e.event_id
-        LEFT JOIN disciplines d ON e.discipline_code = d.code
-        LEFT JOIN venues v ON su.venue_code = v.code
-        WHERE DATE(su.start_time) = %s
+    # Query Olympic events for the date (range predicate keeps start_time index usable)
+    query = EVENT_SELECT + """
+        WHERE su.start_time >= %s::date
+        AND su.start_time < %s::date + 1
         ORDER BY su.start_time
     """
 
-    events_data = execute_query_dict(query, (date,))
+    events_data = execute_prepared_dict('schedule_by_date', query, (date, date))
 
     if not events_data:
         return ScheduleResponse(
@@ -107,85 +164,8 @@ def get_schedule(date: str):
             events=[]
         )
 
-    # Build events with competitors and broadcasts
-    events = []
-    medal_count = 0
-
-    for event_data in events_data:
-        event_unit_code = event_data['event_unit_code']
-
-        # Get competitors for this event
-        competitors_query = """
-            SELECT c.code, c.name, c.noc, c.competitor_type
-            FROM unit_competitors uc
-            JOIN competitors c ON uc.competitor_code = c.code
-            WHERE uc.event_unit_code = %s
-            ORDER BY uc.start_order
-        """
-        competitors_data = execute_query_dict(competitors_query, (event_unit_code,))
-        competitors = [
-            Competitor(
-                code=c['code'],
-                name=c['name'],
-                noc=c['noc'],
-                competitor_type=c['competitor_type']
-            )
-            for c in competitors_data
-        ]
-
-        # Get broadcasts for this event
-        broadcasts_query = """
-            SELECT
-                nb.drupal_id,
-                nb.title,
-                nb.network_name as network,
-                nb.start_time,
-                nb.end_time,
-                nb.day_part,
-                nb.summary,
-                nb.video_url,
-                nb.is_replay
-            FROM nbc_broadcast_units nbu
-            JOIN nbc_broadcasts nb ON nbu.broadcast_drupal_id = nb.drupal_id
-            WHERE nbu.unit_code = %s
-            ORDER BY nb.start_time
-        """
-        broadcasts_data = execute_query_dict(broadcasts_query, (event_unit_code,))
-        broadcasts = [
-            Broadcast(
-                drupal_id=b['drupal_id'],
-                title=b['title'],
-                network=b['network'],
-                start_time=b['start_time'],
-                end_time=b['end_time'],
-                day_part=b['day_part'],
-                summary=b['summary'],
-                video_url=b['video_url'],
-                is_replay=b['is_replay']
-            )
-            for b in broadcasts_data
-        ]
-
-        event = Event(
-            event_unit_code=event_data['event_unit_code'],
-            event_unit_name=event_data['event_unit_name'],
-            discipline=event_data['discipline'] or 'Unknown',
-            event_name=event_data['event_name'] or 'Unknown',
-            gender=event_data['gender'],
-            start_time=event_data['start_time'],
-            end_time=event_data['end_time'],
-            venue=event_data['venue'],
-            medal_flag=bool(event_data['medal_flag']),
-            phase_name=event_data['phase_name'],
-            status=event_data['status'],
-            competitors=competitors,
-            broadcasts=broadcasts
-        )
-
-        if event.medal_flag:
-            medal_count += 1
-
-        events.append(event)
+    events = build_events(events_data)
+    medal_count = sum(1 for e in events if e.medal_flag)
 
     return ScheduleResponse(
         date=date,
@@ -196,18 +176,16 @@ def get_schedule(date: str):
 
 
 @app.get("/api/tv/{date}", response_model=TVResponse)
+@cached_response
 def get_tv_schedule(date: str):
     """
     Get NBC broadcast schedule for a given date, grouped by network.
     Format: YYYY-MM-DD
     """
-    # Validate date format
-    try:
-        datetime.strptime(date, '%Y-%m-%d')
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    _validate_date(date)
 
-    # Query broadcasts for the date
+    # Query broadcasts for the date, with linked events and rundown segments
+    # aggregated per broadcast so the whole schedule is one round-trip
     query = """
         SELECT
             nb.drupal_id,
@@ -222,13 +200,38 @@ def get_tv_schedule(date: str):
             nb.peacock_url,
             nb.is_medal_session,
             nb.is_replay,
-            nb.olympic_day
+            nb.olympic_day,
+            COALESCE(le.linked_events, '[]'::jsonb) as linked_events,
+            COALESCE(rd.rundown, '[]'::jsonb) as rundown
         FROM nbc_broadcasts nb
-        WHERE DATE(nb.start_time) = %s
+        LEFT JOIN LATERAL (
+            SELECT jsonb_agg(jsonb_build_object(
+                'event_unit_code', su.event_unit_code,
+                'event_unit_name', su.event_unit_name,
+                'discipline', COALESCE(d.name, 'Unknown'),
+                'medal_flag', COALESCE(su.medal_flag::int, 0) = 1
+            ) ORDER BY su.start_time) as linked_events
+            FROM nbc_broadcast_units nbu
+            JOIN schedule_units su ON nbu.unit_code = su.event_unit_code
+            LEFT JOIN events e ON su.event_id = e.event_id
+            LEFT JOIN disciplines d ON e.discipline_code = d.code
+            WHERE nbu.broadcast_drupal_id = nb.drupal_id
+        ) le ON true
+        LEFT JOIN LATERAL (
+            SELECT jsonb_agg(jsonb_build_object(
+                'header', r.header,
+                'description', r.description,
+                'segment_time', r.segment_time
+            ) ORDER BY r.segment_order) as rundown
+            FROM nbc_broadcast_rundown r
+            WHERE r.broadcast_drupal_id = nb.drupal_id
+        ) rd ON true
+        WHERE nb.start_time >= %s::date
+        AND nb.start_time < %s::date + 1
         ORDER BY nb.network_name, nb.start_time
     """
 
-    broadcasts_data = execute_query_dict(query, (date,))
+    broadcasts_data = execute_prepared_dict('tv_schedule_by_date', query, (date, date))
 
     # Group broadcasts by network
     networks = {}
@@ -240,48 +243,6 @@ def get_tv_schedule(date: str):
         if network not in networks:
             networks[network] = []
 
-        # Get linked events for this broadcast
-        events_query = """
-            SELECT
-                su.event_unit_code,
-                su.event_unit_name,
-                d.name as discipline,
-                su.medal_flag
-            FROM nbc_broadcast_units nbu
-            JOIN schedule_units su ON nbu.unit_code = su.event_unit_code
-            LEFT JOIN events e ON su.event_id = e.event_id
-            LEFT JOIN disciplines d ON e.discipline_code = d.code
-            WHERE nbu.broadcast_drupal_id = %s
-            ORDER BY su.start_time
-        """
-        events_data = execute_query_dict(events_query, (broadcast['drupal_id'],))
-        linked_events = [
-            LinkedEvent(
-                event_unit_code=e['event_unit_code'],
-                event_unit_name=e['event_unit_name'],
-                discipline=e['discipline'] or 'Unknown',
-                medal_flag=bool(e['medal_flag'])
-            )
-            for e in events_data
-        ]
-
-        # Get rundown segments for this broadcast
-        rundown_query = """
-            SELECT header, description, segment_time
-            FROM nbc_broadcast_rundown
-            WHERE broadcast_drupal_id = %s
-            ORDER BY segment_order
-        """
-        rundown_data = execute_query_dict(rundown_query, (broadcast['drupal_id'],))
-        rundown = [
-            RundownSegment(
-                header=r['header'],
-                description=r['description'],
-                segment_time=r['segment_time']
-            )
-            for r in rundown_data
-        ]
-
         broadcast_detail = BroadcastDetail(
             drupal_id=broadcast['drupal_id'],
             title=broadcast['title'],
@@ -295,8 +256,8 @@ def get_tv_schedule(date: str):
             is_medal_session=broadcast['is_medal_session'],
             is_replay=broadcast['is_replay'],
             olympic_day=broadcast['olympic_day'],
-            linked_events=linked_events,
-            rundown=rundown
+            linked_events=broadcast['linked_events'],
+            rundown=broadcast['rundown']
         )
 
         networks[network].append(broadcast_detail)
@@ -305,6 +266,7 @@ def get_tv_schedule(date: str):
 
 
 @app.get("/api/dates", response_model=DatesResponse)
+@cached_response
 def get_dates():
     """
     Get all available dates with event counts.
@@ -322,8 +284,6 @@ def get_dates():
         ORDER BY date
     """
 
-    dates_data = execute_query_dict(query)
-
     dates = [
         DateInfo(
             date=d['date'],
@@ -331,7 +291,7 @@ def get_dates():
             medal_events=d['medal_events'],
             broadcast_count=d['broadcast_count']
         )
-        for d in dates_data
+        for d in execute_query_dict_streaming(query)
     ]
 
     return DatesResponse(dates=dates)
@@ -343,121 +303,9 @@ def get_medals(date: str):
     Get only medal events for a given date with broadcast info.
     Format: YYYY-MM-DD
     """
-    # Validate date format
-    try:
-        datetime.strptime(date, '%Y-%m-%d')
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
-
-    # Query medal events for the date
-    query = """
-        SELECT
-            su.event_unit_code,
-            su.event_unit_name,
-            d.name as discipline,
-            e.name as event_name,
-            e.gender_code as gender,
-            su.start_time,
-            su.end_time,
-            v.name as venue,
-            su.medal_flag,
-            su.phase_name,
-            su.status,
-            su.id as schedule_unit_id
-        FROM schedule_units su
-        LEFT JOIN events e ON su.event_id = e.event_id
-        LEFT JOIN disciplines d ON e.discipline_code = d.code
-        LEFT JOIN venues v ON su.venue_code = v.code
-        WHERE DATE(su.start_time) = %s
-        AND su.medal_flag = 1
-        ORDER BY su.start_time
-    """
-
-    events_data = execute_query_dict(query, (date,))
-
-    if not events_data:
-        return ScheduleResponse(
-            date=date,
-            medal_events_count=0,
-            total_events=0,
-            events=[]
-        )
-
-    # Build events with competitors and broadcasts
-    events = []
-
-    for event_data in events_data:
-        event_unit_code = event_data['event_unit_code']
-
-        # Get competitors for this event
-        competitors_query = """
-            SELECT c.code, c.name, c.noc, c.competitor_type
-            FROM unit_competitors uc
-            JOIN competitors c ON uc.competitor_code = c.code
-            WHERE uc.event_unit_code = %s
-            ORDER BY uc.start_order
-        """
-        competitors_data = execute_query_dict(competitors_query, (event_unit_code,))
-        competitors = [
-            Competitor(
-                code=c['code'],
-                name=c['name'],
-                noc=c['noc'],
-                competitor_type=c['competitor_type']
-            )
-            for c in competitors_data
-        ]
-
-        # Get broadcasts for this event
-        broadcasts_query = """
-            SELECT
-                nb.drupal_id,
-                nb.title,
-                nb.network_name as network,
-                nb.start_time,
-                nb.end_time,
-                nb.day_part,
-                nb.summary,
-                nb.video_url,
-                nb.is_replay
-            FROM nbc_broadcast_units nbu
-            JOIN nbc_broadcasts nb ON nbu.broadcast_drupal_id = nb.drupal_id
-            WHERE nbu.unit_code = %s
-            ORDER BY nb.start_time
-        """
-        broadcasts_data = execute_query_dict(broadcasts_query, (event_unit_code,))
-        broadcasts = [
-            Broadcast(
-                drupal_id=b['drupal_id'],
-                title=b['title'],
-                network=b['network'],
-                start_time=b['start_time'],
-                end_time=b['end_time'],
-                day_part=b['day_part'],
-                summary=b['summary'],
-                video_url=b['video_url'],
-                is_replay=b['is_replay']
-            )
-            for b in broadcasts_data
-        ]
-
-        event = Event(
-            event_unit_code=event_data['event_unit_code'],
-            event_unit_name=event_data['event_unit_name'],
-            discipline=event_data['discipline'] or 'Unknown',
-            event_name=event_data['event_name'] or 'Unknown',
-            gender=event_data['gender'],
-            start_time=event_data['start_time'],
-            end_time=event_data['end_time'],
-            venue=event_data['venue'],
-            medal_flag=bool(event_data['medal_flag']),
-            phase_name=event_data['phase_name'],
-            status=event_data['status'],
-            competitors=competitors,
-            broadcasts=broadcasts
-        )
-
-        events.append(event)
+    # Filter the (cached) full schedule so both endpoints share one query and cache entry
+    schedule = get_schedule(date=date)
+    events = [e for e in schedule.events if e.medal_flag]
 
     return ScheduleResponse(
         date=date,
@@ -467,7 +315,7 @@ def get_medals(date: str):
     )
 
 
-@app.get("/api/search")
+@app.get("/api/search", response_model=SearchResponse)
 def search_events(q: str = Query(..., min_length=1)):
     """
     Search events by discipline, event name, or country.
@@ -475,29 +323,30 @@ def search_events(q: str = Query(..., min_length=1)):
     # Build search query with wildcards
     search_term = f"%{q}%"
 
-    query = """
-        SELECT DISTINCT
-            su.event_unit_code,
-            su.event_unit_name,
-            d.name as discipline,
-            e.name as event_name,
-            e.gender_code as gender,
-            su.start_time,
-            su.end_time,
-            v.name as venue,
-            su.medal_flag,
-            su.phase_name,
-            su.status
-        FROM schedule_units su
-        LEFT JOIN events e ON su.event_id = e.event_id
-        LEFT JOIN disciplines d ON e.discipline_code = d.code
-        LEFT JOIN venues v ON su.venue_code = v.code
-        LEFT JOIN unit_competitors uc ON su.event_unit_code = uc.event_unit_code
-        LEFT JOIN competitors c ON uc.competitor_code = c.code
-        WHERE d.name ILIKE %s
-        OR e.name ILIKE %s
-        OR c.name ILIKE %s
-        OR c.noc ILIKE %s
+    # One UNION branch per searched column, so each can use its trigram index
+    query = EVENT_SELECT + """
+        WHERE su.event_unit_code IN (
+            SELECT su2.event_unit_code
+            FROM schedule_units su2
+            JOIN events e2 ON su2.event_id = e2.event_id
+            JOIN disciplines d2 ON e2.discipline_code = d2.code
+            WHERE d2.name ILIKE %s
+            UNION
+            SELECT su2.event_unit_code
+            FROM schedule_units su2
+            JOIN events e2 ON su2.event_id = e2.event_id
+            WHERE e2.name ILIKE %s
+            UNION
+            SELECT uc.event_unit_code
+            FROM unit_competitors uc
+            JOIN competitors c ON uc.competitor_code = c.code
+            WHERE c.name ILIKE %s
+            UNION
+            SELECT uc.event_unit_code
+            FROM unit_competitors uc
+            JOIN competitors c ON uc.competitor_code = c.code
+            WHERE c.noc ILIKE %s
+        )
         ORDER BY su.start_time
         LIMIT 50
     """
@@ -505,95 +354,17 @@ def search_events(q: str = Query(..., min_length=1)):
     events_data = execute_query_dict(query, (search_term, search_term, search_term, search_term))
 
     if not events_data:
-        return {"results": [], "count": 0}
+        return SearchResponse(results=[], count=0)
 
-    # Build results with competitors and broadcasts
-    results = []
+    results = build_events(events_data)
 
-    for event_data in events_data:
-        event_unit_code = event_data['event_unit_code']
-
-        # Get competitors for this event
-        competitors_query = """
-            SELECT c.code, c.name, c.noc, c.competitor_type
-            FROM unit_competitors uc
-            JOIN competitors c ON uc.competitor_code = c.code
-            WHERE uc.event_unit_code = %s
-            ORDER BY uc.start_order
-        """
-        competitors_data = execute_query_dict(competitors_query, (event_unit_code,))
-        competitors = [
-            Competitor(
-                code=c['code'],
-                name=c['name'],
-                noc=c['noc'],
-                competitor_type=c['competitor_type']
-            )
-            for c in competitors_data
-        ]
-
-        # Get broadcasts for this event
-        broadcasts_query = """
-            SELECT
-                nb.drupal_id,
-                nb.title,
-                nb.network_name as network,
-                nb.start_time,
-                nb.end_time,
-                nb.day_part,
-                nb.summary,
-                nb.video_url,
-                nb.is_replay
-            FROM nbc_broadcast_units nbu
-            JOIN nbc_broadcasts nb ON nbu.broadcast_drupal_id = nb.drupal_id
-            WHERE nbu.unit_code = %s
-            ORDER BY nb.start_time
-        """
-        broadcasts_data = execute_query_dict(broadcasts_query, (event_unit_code,))
-        broadcasts = [
-            Broadcast(
-                drupal_id=b['drupal_id'],
-                title=b['title'],
-                network=b['network'],
-                start_time=b['start_time'],
-                end_time=b['end_time'],
-                day_part=b['day_part'],
-                summary=b['summary'],
-                video_url=b['video_url'],
-                is_replay=b['is_replay']
-            )
-            for b in broadcasts_data
-        ]
-
-        event = Event(
-            event_unit_code=event_data['event_unit_code'],
-            event_unit_name=event_data['event_unit_name'],
-            discipline=event_data['discipline'] or 'Unknown',
-            event_name=event_data['event_name'] or 'Unknown',
-            gender=event_data['gender'],
-            start_time=event_data['start_time'],
-            end_time=event_data['end_time'],
-            venue=event_data['venue'],
-            medal_flag=bool(event_data['medal_flag']),
-            phase_name=event_data['phase_name'],
-            status=event_data['status'],
-            competitors=competitors,
-            broadcasts=broadcasts
-        )
-
-        results.append(event)
-
-    return {"results": results, "count": len(results)}
+    return SearchResponse(results=results, count=len(results))
 
 
 @app.get("/api/euro/{date}", response_model=EuroTVResponse)
 def get_euro_schedule(date: str):
     """Get European broadcast schedule for a given date, grouped by channel."""
-    # Validate date
-    try:
-        datetime.strptime(date, '%Y-%m-%d')
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    _validate_date(date)
 
     query = """
         SELECT
@@ -610,12 +381,13 @@ def get_euro_schedule(date: str):
             eb.is_replay
         FROM euro_broadcasts eb
         JOIN euro_channels ec ON eb.channel_code = ec.channel_code
-        WHERE DATE(eb.start_time) = %s
+        WHERE eb.start_time >= %s::date
+        AND eb.start_time < %s::date + 1
         AND ec.is_active = TRUE
         ORDER BY ec.country_code, ec.display_name, eb.start_time
     """
 
-    broadcasts_data = execute_query_dict(query, (date,))
+    broadcasts_data = execute_prepared_dict('euro_by_date', query, (date, date))
 
     # Group by channel_code
     channels = {}
@@ -648,13 +420,10 @@ def get_commentary(date: Optional[str] = None):
     - today_recaps: post_event commentary from today
     - previous_recaps: post_event commentary from previous days
     """
-    from datetime import date as date_type, timedelta
+    from datetime import timedelta
 
     if date:
-        try:
-            target = datetime.strptime(date, '%Y-%m-%d').date()
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+        target = _validate_date(date)
     else:
         target = date_type.today()
 
@@ -784,4 +553,5 @@ def get_commentary(date: Optional[str] = None):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    # Local development only; production runs under gunicorn (see run-production.sh)
+    uvicorn.run("api.main:app", host="0.0.0.0", port=8000, reload=ENVIRONMENT == "development")
@@ -3,7 +3,7 @@ Pydantic models for API responses
 """
 
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
 
@@ -80,9 +80,14 @@ class ScheduleResponse(BaseModel):
     events: List[Event]
 
 
+class SearchResponse(BaseModel):
+    results: List[Event]
+    count: int
+
+
 class TVResponse(BaseModel):
     date: str
-    networks: dict
+    networks: Dict[str, List[BroadcastDetail]]
 
 
 class EuroBroadcast(BaseModel):
@@ -101,7 +106,7 @@ class EuroBroadcast(BaseModel):
 
 class EuroTVResponse(BaseModel):
     date: str
-    channels: dict  # channel_code -> list of EuroBroadcast
+    channels: Dict[str, List[EuroBroadcast]]  # channel_code -> broadcasts
 
 
 class DateInfo(BaseModel):
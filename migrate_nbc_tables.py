@@ -4,8 +4,9 @@ Migration script to create NBC broadcast tables
 This script needs to run as postgres (superuser) to create new tables
 """
 
-import subprocess
+import os
 import sys
+import psycopg2
 
 # SQL migration commands
 migration_sql = """
@@ -60,32 +61,39 @@ SELECT 'NBC broadcast tables created successfully' as status;
 """
 
 def execute_migration():
-    """Execute the migration SQL"""
+    """Execute the migration SQL in a single transaction"""
     try:
-        # Use snap run postgresql.psql with postgres user via Unix socket
-        cmd = [
-            'snap', 'run', 'postgresql.psql',
-            '-U', 'postgres',
-            '-d', 'olympics_tv',
-            '-h', '/tmp',  # Unix socket
-            '-c', migration_sql
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        # postgres superuser via the Unix socket in /tmp
+        conn = psycopg2.connect(
+            host=os.getenv('MIGRATION_DB_HOST', '/tmp'),
+            user='postgres',
+            dbname='olympics_tv'
+        )
+    except psycopg2.Error as e:
+        print(f"❌ Could not connect as postgres: {e}")
+        return False
 
-        if result.returncode != 0:
-            print("❌ Migration failed:")
-            print(result.stderr)
-            return False
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute(migration_sql)
+                status = cur.fetchone()
 
         print("✓ Migration completed successfully!")
-        print(result.stdout)
+        print(status[0] if status else '')
         return True
 
-    except Exception as e:
-        print(f"❌ Error executing migration: {e}")
+    except psycopg2.Error as e:
+        # `with conn` has rolled the transaction back
+        print("❌ Migration failed:")
+        print(f"  [{e.pgcode}] {e.pgerror or e}")
+        if e.diag.statement_position:
+            print(f"  at character {e.diag.statement_position}")
         return False
 
+    finally:
+        conn.close()
+
 if __name__ == '__main__':
     print("Starting NBC broadcast tables migration...")
     print("This script requires postgres (superuser) access.\n")
@@ -0,0 +1,27 @@
+-- Indexes backing the date-range and batched lookups in api/main.py
+-- Migration 006
+--
+-- The API filters by day with `start_time >= day AND start_time < day + 1`
+-- rather than DATE(start_time), so plain btree indexes on start_time serve
+-- the range scan. (An expression index on DATE(timestamptz) is not possible:
+-- the cast depends on the session TimeZone and is not IMMUTABLE.)
+--
+-- CONCURRENTLY cannot run inside a transaction block, so run with autocommit:
+-- sudo -u postgres psql -d olympics_tv -f migrations/006_add_api_lookup_indexes.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_schedule_units_start_time
+    ON schedule_units(start_time);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_nbc_broadcasts_start_time
+    ON nbc_broadcasts(start_time);
+
+-- Per-event competitor/broadcast aggregation and per-broadcast lookups
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_unit_competitors_event_unit_code
+    ON unit_competitors(event_unit_code, start_order);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_nbc_broadcast_units_unit_code
+    ON nbc_broadcast_units(unit_code);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_nbc_broadcast_units_broadcast_drupal_id
+    ON nbc_broadcast_units(broadcast_drupal_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_nbc_broadcast_rundown_broadcast
+    ON nbc_broadcast_rundown(broadcast_drupal_id, segment_order);
+
+SELECT 'API lookup indexes created' as status;
@@ -0,0 +1,22 @@
+-- Trigram indexes backing the ILIKE '%term%' lookups in /api/search
+-- Migration 007
+--
+-- A leading-wildcard ILIKE cannot use a btree index; pg_trgm's gin_trgm_ops
+-- lets each branch of the search UNION use an index (for terms of 3+ chars).
+--
+-- CREATE EXTENSION needs superuser, and CONCURRENTLY cannot run inside a
+-- transaction block, so run with autocommit as postgres:
+-- sudo -u postgres psql -d olympics_tv -f migrations/007_add_search_trgm_indexes.sql
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_disciplines_name_trgm
+    ON disciplines USING gin (name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_events_name_trgm
+    ON events USING gin (name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_competitors_name_trgm
+    ON competitors USING gin (name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_competitors_noc_trgm
+    ON competitors USING gin (noc gin_trgm_ops);
+
+SELECT 'Search trigram indexes created' as status;
@@ -0,0 +1,21 @@
+-- Memo cache for the commentary editor's fact-check and prose-edit calls
+-- Migration 008
+--
+-- cache_key is the SHA-256 of (model, system prompt, every prompt input), so a
+-- re-run over unchanged commentary reuses the stored output instead of paying
+-- for the same Claude call again. Rows are safe to delete at any time.
+
+CREATE TABLE IF NOT EXISTS commentary_edit_cache (
+    cache_key CHAR(64) PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL CHECK (kind IN ('fact_check', 'prose_edit')),
+    output TEXT NOT NULL,
+    issues TEXT,
+    usage JSONB,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_commentary_edit_cache_created ON commentary_edit_cache(created_at);
+
+GRANT SELECT, INSERT, DELETE ON commentary_edit_cache TO stosh99;
+
+SELECT 'commentary_edit_cache table created' as status;
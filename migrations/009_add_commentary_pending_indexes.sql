@@ -0,0 +1,20 @@
+-- Partial indexes serving the scheduler's "already has commentary" probes
+-- Migration 009
+--
+-- get_post_event_pending / get_pre_event_pending check
+--   NOT EXISTS (SELECT 1 FROM commentary c WHERE c.event_unit_code = su.event_unit_code
+--               AND c.commentary_type = '<type>' AND c.content IS NOT NULL)
+-- Each partial index holds only the rows that probe can match, so the anti
+-- join is an index-only lookup instead of a scan of commentary.
+--
+-- CONCURRENTLY cannot run inside a transaction block, so run with autocommit:
+-- sudo -u postgres psql -d olympics_tv -f migrations/009_add_commentary_pending_indexes.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_commentary_post_event_written
+    ON commentary(event_unit_code)
+    WHERE commentary_type = 'post_event' AND content IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_commentary_pre_event_written
+    ON commentary(event_unit_code)
+    WHERE commentary_type = 'pre_event' AND content IS NOT NULL;
+
+SELECT 'Commentary pending-probe indexes created' as status;
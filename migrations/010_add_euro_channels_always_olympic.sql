@@ -0,0 +1,16 @@
+-- Per-channel flag letting euro_scraper skip the Olympic keyword filter
+-- Migration 010
+--
+-- For a channel that carries nothing but Games coverage during the Olympic
+-- window (e.g. a dedicated Olympics feed), every programme is Olympic, so
+-- scanning each title/description for keywords is wasted work. Set
+-- always_olympic = TRUE on such channels and euro_scraper stores all of their
+-- programmes. Defaults to FALSE, so existing channels keep being filtered.
+--
+-- Example:
+-- UPDATE euro_channels SET always_olympic = TRUE WHERE channel_code = '<code>';
+
+ALTER TABLE euro_channels
+ADD COLUMN IF NOT EXISTS always_olympic BOOLEAN NOT NULL DEFAULT FALSE;
+
+SELECT 'always_olympic column added to euro_channels' as status;
@@ -0,0 +1,20 @@
+-- Unique (event_unit_code, commentary_type) so status writes can UPSERT
+-- Migration 011
+--
+-- intro_orchestrator.update_status uses
+--   INSERT ... ON CONFLICT (event_unit_code, commentary_type) DO UPDATE
+-- which needs a unique index on exactly those columns. The pipeline already
+-- keeps one row per event and type; 'general' / 'city' rows have a NULL
+-- event_unit_code and NULLs never conflict, so they are unaffected.
+--
+-- If the build fails on duplicates, find them first with:
+--   SELECT event_unit_code, commentary_type, COUNT(*) FROM commentary
+--   GROUP BY 1, 2 HAVING COUNT(*) > 1;
+--
+-- CONCURRENTLY cannot run inside a transaction block, so run with autocommit:
+-- sudo -u postgres psql -d olympics_tv -f migrations/011_add_commentary_event_type_unique.sql
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_commentary_event_unit_type
+    ON commentary(event_unit_code, commentary_type);
+
+SELECT 'Commentary (event_unit_code, commentary_type) unique index created' as status;
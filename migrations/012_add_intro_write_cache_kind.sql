@@ -0,0 +1,12 @@
+-- Let commentary_edit_cache also memoize intro_writer's preview calls
+-- Migration 012
+--
+-- intro_writer.write_intro keys on SHA-256 of (model, prompt version, system
+-- prompt, whitespace-normalized consolidated text) and stores the preview
+-- under kind 'intro_write', so re-running an unchanged event costs nothing.
+
+ALTER TABLE commentary_edit_cache DROP CONSTRAINT IF EXISTS commentary_edit_cache_kind_check;
+ALTER TABLE commentary_edit_cache ADD CONSTRAINT commentary_edit_cache_kind_check
+    CHECK (kind IN ('fact_check', 'prose_edit', 'intro_write'));
+
+SELECT 'commentary_edit_cache accepts intro_write' as status;
@@ -0,0 +1,13 @@
+-- Let commentary_edit_cache also memoize the combined fact-check + prose edit
+-- Migration 013
+--
+-- commentary_editor.combined_edit, the packed batch editor and the Message
+-- Batch editor all key on SHA-256 of (model, COMBINED_SYSTEM, commentary,
+-- results, sources) and store the edit under kind 'combined', so re-running
+-- the scheduler over unchanged commentary skips the edit call.
+
+ALTER TABLE commentary_edit_cache DROP CONSTRAINT IF EXISTS commentary_edit_cache_kind_check;
+ALTER TABLE commentary_edit_cache ADD CONSTRAINT commentary_edit_cache_kind_check
+    CHECK (kind IN ('fact_check', 'prose_edit', 'intro_write', 'combined'));
+
+SELECT 'commentary_edit_cache accepts combined' as status;
@@ -18,15 +18,16 @@ echo "   Debug: $DEBUG"
 echo "   Database: $DB_USER@$DB_HOST:$DB_PORT/$DB_NAME"
 echo ""
 
-# Start backend API with Gunicorn + Uvicorn
+# Start backend API with Gunicorn + Uvicorn (2 x cores + 1 workers unless overridden)
+WORKERS=${WEB_CONCURRENCY:-$((2 * $(nproc) + 1))}
 echo "📡 Starting Backend API..."
-echo "   Command: gunicorn api.main:app -w 4 -k uvicorn.workers.UvicornWorker"
-echo "   Workers: 4"
+echo "   Command: gunicorn api.main:app -w $WORKERS -k uvicorn.workers.UvicornWorker"
+echo "   Workers: $WORKERS"
 echo "   Host: 0.0.0.0:8000"
 echo ""
 
 gunicorn api.main:app \
-  -w 4 \
+  -w $WORKERS \
   -k uvicorn.workers.UvicornWorker \
   --bind 0.0.0.0:8000 \
   --access-logfile - \
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Commentary Batch - Runs the writer and the combined fact-check + prose edit for
+many events through the Anthropic Message Batches API.
+
+Batches are billed at 50% of the synchronous price and don't count against the
+per-minute rate limits, at the cost of latency (results usually arrive within
+minutes, worst case 24h). The scheduler's cron runs aren't latency-sensitive,
+so run_post_events uses this path for non-dry runs with enough events: one
+writer batch, then one editor batch. Pre-event runs (intro_orchestrator.
+process_events) batch the preview writer the same way.
+
+Events whose batch request errors, expires or can't be parsed fall back to the
+synchronous write_commentary / edit_commentary.
+"""
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import os
+import time
+import logging
+
+from rate_limiter import with_retries
+from commentary_editor import (
+    _CLIENT, MODEL, COMBINED_SYSTEM, COMBINED_MAX_TOKENS,
+    Usage, _cached_block, combined_prompt, parse_combined_result, edit_commentary,
+    _combined_key, _combined_cache_get, _combined_cache_put,
+)
+from commentary_writer import writer_params, writer_result, write_commentary
+from intro_writer import (
+    writer_params as intro_params, writer_result as intro_result, write_intro,
+    _cache_key as _intro_cache_key, _cache_get as _intro_cache_get, _cache_put as _intro_cache_put,
+)
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = int(os.getenv('EDIT_BATCH_POLL_SECONDS', '30'))
+# Give up waiting after this long; unfinished events fall back to synchronous calls
+MAX_WAIT_SECONDS = int(os.getenv('EDIT_BATCH_MAX_WAIT_SECONDS', str(2 * 60 * 60)))
+
+# Message Batches are billed at half the synchronous per-token price
+BATCH_PRICE_FACTOR = 0.5
+
+
+def _edit_request(job):
+    """Editor Message Batches request for a prepared job (custom_id = event code)."""
+    return {
+        'custom_id': job['event_unit_code'],
+        'params': {
+            'model': MODEL,
+            'max_tokens': COMBINED_MAX_TOKENS,
+            'system': [_cached_block(COMBINED_SYSTEM)],
+            'messages': [{
+                'role': 'user',
+                'content': combined_prompt(job['commentary'], job['resolved_data'],
+                                           job['sources_metadata'], job.get('consolidated_text', '')),
+            }],
+        },
+    }
+
+
+def _wait_for_batch(batch_id):
+    """Poll until the batch has ended. Returns False on timeout (batch is cancelled)."""
+    deadline = time.monotonic() + MAX_WAIT_SECONDS
+    while True:
+        batch = with_retries(lambda: _CLIENT.messages.batches.retrieve(batch_id))
+        if batch.processing_status == 'ended':
+            counts = batch.request_counts
+            logger.info(f"  Batch {batch_id} ended: {counts.succeeded} succeeded, "
+                        f"{counts.errored} errored, {counts.expired} expired")
+            return True
+        if time.monotonic() >= deadline:
+            logger.warning(f"  Batch {batch_id} still {batch.processing_status} after "
+                           f"{MAX_WAIT_SECONDS}s, cancelling")
+            with_retries(lambda: _CLIENT.messages.batches.cancel(batch_id))
+            return False
+        time.sleep(POLL_SECONDS)
+
+
+def run_batch(requests):
+    """
+    Submit requests as one Message Batch and wait for it. Returns the result
+    Message keyed by custom_id for every request that succeeded ({} on failure).
+    """
+    if _CLIENT is None:
+        logger.error("ANTHROPIC_API_KEY not configured")
+        return {}
+
+    messages = {}
+    try:
+        batch = with_retries(lambda: _CLIENT.messages.batches.create(requests=requests))
+        logger.info(f"  Submitted batch {batch.id} ({len(requests)} requests)")
+        if not _wait_for_batch(batch.id):
+            return {}
+        for entry in with_retries(lambda: _CLIENT.messages.batches.results(batch.id)):
+            if entry.result.type == 'succeeded':
+                messages[entry.custom_id] = entry.result.message
+            else:
+                logger.warning(f"  {entry.custom_id}: batch request {entry.result.type}")
+    except Exception as e:
+        logger.error(f"Batch failed: {e}")
+    return messages
+
+
+def batch_write_jobs(jobs):
+    """
+    Write commentary for scraped jobs (pipeline_orchestrator.scrape_event output)
+    in one Message Batch. Returns write_commentary-shaped results in input order.
+    """
+    messages = run_batch([
+        {'custom_id': j['event_unit_code'], 'params': writer_params(j['consolidated_text'])}
+        for j in jobs
+    ])
+
+    results = []
+    for job in jobs:
+        message = messages.get(job['event_unit_code'])
+        if message:
+            results.append(writer_result(message, price_factor=BATCH_PRICE_FACTOR))
+        else:
+            results.append(write_commentary(job['consolidated_text']))
+    return results
+
+
+def batch_write_intros(jobs):
+    """
+    Write previews for scraped intro jobs (intro_orchestrator.scrape_intro output)
+    in one Message Batch; previews already in the response cache skip the batch.
+    Returns write_intro-shaped results in input order.
+    """
+    keys = [_intro_cache_key(j['consolidated']) for j in jobs]
+    results = [_intro_cache_get(k) for k in keys]
+    todo = [i for i, r in enumerate(results) if not r]
+
+    messages = run_batch([
+        {'custom_id': jobs[i]['event_unit_code'], 'params': intro_params(jobs[i]['consolidated'])}
+        for i in todo
+    ]) if todo else {}
+
+    for i in todo:
+        message = messages.get(jobs[i]['event_unit_code'])
+        if message:
+            results[i] = intro_result(message, price_factor=BATCH_PRICE_FACTOR)
+            _intro_cache_put(keys[i], results[i])
+        else:
+            results[i] = write_intro(jobs[i]['consolidated'])
+    return results
+
+
+def batch_edit_jobs(jobs):
+    """
+    Edit prepared jobs (pipeline_orchestrator.prepare_event output) in one
+    Message Batch; edits already in the edit cache skip the batch.
+    Returns edit_commentary-shaped results in input order.
+    """
+    keys = [_combined_key(j['commentary'], j['resolved_data'], j['sources_metadata'],
+                          j.get('consolidated_text', '')) for j in jobs]
+    results = [_combined_cache_get(k) for k in keys]
+    todo = [i for i, r in enumerate(results) if not r]
+
+    messages = run_batch([_edit_request(jobs[i]) for i in todo]) if todo else {}
+
+    for i in todo:
+        job = jobs[i]
+        message = messages.get(job['event_unit_code'])
+        result = message and parse_combined_result(
+            message.content[0].text, Usage.from_response(message.usage), BATCH_PRICE_FACTOR)
+        if result:
+            logger.info(f"  {job['event_unit_code']}: edited (batch), ~${result['estimated_cost']:.4f}")
+            _combined_cache_put(keys[i], result)
+        else:
+            result = edit_commentary(job['commentary'], job['resolved_data'],
+                                     job['sources_metadata'], job.get('consolidated_text', ''))
+        results[i] = result
+    return results
+
+
+if __name__ == '__main__':
+    print("Commentary Batch - writer + combined edit via the Message Batches API")
+    print("Normally called via commentary_scheduler.py")
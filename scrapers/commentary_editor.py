@@ -1,19 +1,27 @@
 #!/usr/bin/env python3
 """
-Commentary Editor - Two-agent editing pipeline:
+Commentary Editor - Fact-check + prose-edit pipeline:
   1. Fact-checker: validates claims against results + sources
   2. Prose editor: style, flow, tone polish
 
-Replaces the single-editor approach for better accuracy.
+Both steps normally run in ONE Claude call (COMBINED_SYSTEM) that returns JSON;
+the original two-agent path is kept as a fallback if that response can't be parsed.
 """
 
 from dotenv import load_dotenv
 load_dotenv()
 
 import os
+import re
 import json
+import hashlib
 import logging
+import psycopg2
 import anthropic
+from dataclasses import dataclass, asdict
+
+from rate_limiter import stream_message, estimate_tokens
+from db_pool import pooled_connection
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -21,14 +29,20 @@ logger = logging.getLogger(__name__)
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
 MODEL = "claude-sonnet-4-20250514"
 
+# One client per process so every call reuses its pooled HTTPS connections
+_CLIENT = (
+    anthropic.Anthropic(api_key=ANTHROPIC_API_KEY, max_retries=0)
+    if ANTHROPIC_API_KEY and ANTHROPIC_API_KEY != 'your_key_here' else None
+)
+
 
 # ============================================================
 # AGENT 1: FACT-CHECKER
 # ============================================================
 
-FACTCHECK_SYSTEM = """You are a sports fact-checker for Olympic coverage. Your ONLY job is factual accuracy. Do not touch prose style, tone, or structure.
+_FACTCHECK_ROLE = """You are a sports fact-checker for Olympic coverage. Your ONLY job is factual accuracy. Do not touch prose style, tone, or structure."""
 
-You will receive:
+_FACTCHECK_RULES = """You will receive:
 - RESULTS: verified data from the official Olympics database (ground truth)
 - SOURCES: the articles the writer used
 - COMMENTARY: the written piece to check
@@ -45,9 +59,9 @@ CRITICAL RULES:
 - Only flag CONTRADICTS when the claim directly conflicts with a number, name, position, or medal in the results.
 - Quotes must appear in the source articles. Any quote not in the sources is UNSOURCED.
 - Do not flag reasonable inferences (e.g., "powered through" is color, not a factual claim).
-- Historical context from source articles (e.g., "first Dutch gold since 2014") is SOURCED, not UNSOURCED.
+- Historical context from source articles (e.g., "first Dutch gold since 2014") is SOURCED, not UNSOURCED."""
 
-OUTPUT FORMAT:
+_FACTCHECK_OUTPUT = """OUTPUT FORMAT:
 List each factual issue found, then output the corrected commentary.
 
 ISSUES:
@@ -61,14 +75,16 @@ Then:
 ---
 [Full commentary with only CONTRADICTS and UNSOURCED items fixed. SOURCED items preserved.]"""
 
+FACTCHECK_SYSTEM = f"{_FACTCHECK_ROLE}\n\n{_FACTCHECK_RULES}\n\n{_FACTCHECK_OUTPUT}"
+
 
 # ============================================================
 # AGENT 2: PROSE EDITOR
 # ============================================================
 
-PROSE_SYSTEM = """You are a prose editor for Olympic sports journalism. Your ONLY job is improving the writing quality. Do not change any facts, names, times, or claims.
+_PROSE_ROLE = """You are a prose editor for Olympic sports journalism. Your ONLY job is improving the writing quality. Do not change any facts, names, times, or claims."""
 
-YOUR TASKS:
+_PROSE_RULES = """YOUR TASKS:
 - Fix awkward phrasing or clunky sentences
 - Improve transitions between paragraphs
 - Eliminate repetitive sentence structures (e.g., too many sentences starting with "The...")
@@ -87,67 +103,282 @@ DO NOT:
 - Change any names, times, scores, or positions
 - Alter quotes in any way
 - Significantly change the length (stay within ~10% of original)
-- Restructure the piece (keep the same paragraph order and flow)
+- Restructure the piece (keep the same paragraph order and flow)"""
 
-OUTPUT:
+_PROSE_OUTPUT = """OUTPUT:
 Just output the polished commentary. No commentary about your edits.
 If the prose is already clean, output it unchanged."""
 
+PROSE_SYSTEM = f"{_PROSE_ROLE}\n\n{_PROSE_RULES}\n\n{_PROSE_OUTPUT}"
+
+# Two-pass path: clean fact-checked pieces under this length skip the prose
+# editor. FORCE_PROSE_EDIT=1 always runs it (QA / regression comparisons).
+PROSE_SKIP_MAX_WORDS = 800
+FORCE_PROSE_EDIT = os.getenv('FORCE_PROSE_EDIT', '0') == '1'
+
+
+# ============================================================
+# COMBINED: FACT-CHECK THEN PROSE EDIT, ONE CALL
+# ============================================================
+
+COMBINED_SYSTEM = f"""You are an editor for Olympic sports coverage. You do two jobs, strictly in order.
+
+STEP 1 — FACT-CHECK. Factual accuracy only; do not touch prose in this step.
+
+{_FACTCHECK_RULES}
+
+STEP 2 — PROSE EDIT the fact-checked text from step 1. Writing quality only; do not change any facts, names, times, or claims.
+
+{_PROSE_RULES}
+
+OUTPUT FORMAT:
+Return ONLY a JSON object, with no text before or after it:
+{{"issues": ["[CONTRADICTS] 'Kok finished in 36.50' → Results show 36.49. Fixed.", "[UNSOURCED] 'This was her childhood dream' → Not in any source. Removed."], "polished": "<full commentary after both steps>"}}
+
+Use "issues": [] if no issues were found. "polished" is the complete final commentary, with paragraphs separated by \\n\\n."""
+
+# Combined output carries the issue list as well as the full text
+COMBINED_MAX_TOKENS = 3072
+
+BATCH_SYSTEM = COMBINED_SYSTEM + """
+
+BATCH MODE: the request contains several numbered events, each with its own RESULTS, SOURCES and COMMENTARY. Edit each one independently using only its own results and sources.
+Return ONLY a JSON array with one object per event: [{"id": 1, "issues": [...], "polished": "..."}, ...]"""
+
+# Events packed into one batch_edit_commentary request, and the input budget per request
+EDIT_BATCH_SIZE = int(os.getenv('EDIT_BATCH_SIZE', '4'))
+MAX_BATCH_INPUT_TOKENS = 40000
+
+# Prompt section headers, hoisted so every call sends byte-identical text
+# (any drift in the cached prefix is a prompt-cache miss)
+_HDR_RESULTS = "\n\n=== RESULTS (ground truth from official database) ===\n"
+_HDR_SOURCES = "\n\n=== SOURCE ARTICLES THE WRITER USED ===\n"
+_HDR_FACTCHECK = "=== COMMENTARY TO FACT-CHECK ===\n"
+_HDR_EDIT = "=== COMMENTARY TO EDIT ===\n"
+_FACTCHECK_INTRO = "Fact-check this Olympic commentary."
+_FACTCHECK_FOOTER = "\n\nCheck every factual claim now. Classify each as VERIFIED, SOURCED, CONTRADICTS, or UNSOURCED."
+_COMBINED_INTRO = "Fact-check, then polish, this Olympic commentary."
+_COMBINED_FOOTER = "\n\nCheck every factual claim, fix CONTRADICTS and UNSOURCED items, polish the prose, and return the JSON object."
+_PROSE_INTRO = "Polish the prose of this Olympic commentary. Do not change any facts.\n\n"
+
+# Fact-check output separator: a line holding only '---' (not a '---' inside prose)
+_SPLIT_RE = re.compile(r'(?m)^[ \t]*---[ \t]*$')
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
 
 # ============================================================
 # SHARED HELPERS
 # ============================================================
 
-def _call_claude(system_prompt, user_prompt, label="Agent"):
-    """Shared Claude API call."""
-    if not ANTHROPIC_API_KEY or ANTHROPIC_API_KEY == 'your_key_here':
+def _text_block(text):
+    return {"type": "text", "text": text}
+
+
+def _cached_block(text):
+    """Content block marked as a prompt-cache breakpoint (prefix up to here is cached)."""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+
+# Sonnet pricing, $ per M tokens: input, output, cache read, cache write
+_RATES = (3, 15, 0.3, 3.75)
+
+
+@dataclass(slots=True)
+class Usage:
+    """Token usage for one or more editor calls."""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read: int = 0
+    cache_write: int = 0
+
+    @classmethod
+    def from_response(cls, usage):
+        return cls(usage.input_tokens, usage.output_tokens,
+                   usage.cache_read_input_tokens or 0, usage.cache_creation_input_tokens or 0)
+
+    def cost(self, price_factor=1.0):
+        """Estimated $ cost; price_factor scales prices (0.5 for the Message Batches API)."""
+        r_in, r_out, r_read, r_write = _RATES
+        return round((self.input_tokens * r_in + self.output_tokens * r_out
+                      + self.cache_read * r_read + self.cache_write * r_write)
+                     * price_factor / 1_000_000, 4)
+
+    def share(self, n):
+        """Equal 1/n share, for attributing one batched request to its n events."""
+        return Usage(self.input_tokens // n, self.output_tokens // n,
+                     self.cache_read // n, self.cache_write // n)
+
+    def __add__(self, other):
+        return Usage(self.input_tokens + other.input_tokens,
+                     self.output_tokens + other.output_tokens,
+                     self.cache_read + other.cache_read,
+                     self.cache_write + other.cache_write)
+
+
+def _call_claude(system_prompt, user_prompt, label="Agent", max_tokens=2048, on_delta=None):
+    """
+    Shared Claude API call. user_prompt is a string or a list of content blocks.
+    The system prompt is sent as a cache_control block. It is identical for every
+    event, but currently below Sonnet's 1024-token minimum cacheable prefix, so the
+    marker is a no-op until the prompt grows (the usage cache fields show hits).
+    The response is streamed; on_delta(text) is called with each chunk as it arrives.
+    """
+    if _CLIENT is None:
         logger.error("ANTHROPIC_API_KEY not configured")
         return None
 
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
-
     try:
-        response = client.messages.create(
+        # Waits for rate-limit headroom before sending rather than eating a 429
+        response = stream_message(
+            _CLIENT,
+            on_delta=on_delta,
             model=MODEL,
-            max_tokens=2048,
-            system=system_prompt,
+            max_tokens=max_tokens,
+            system=[_cached_block(system_prompt)],
             messages=[{"role": "user", "content": user_prompt}]
         )
         content = response.content[0].text
-        usage = {
-            'input_tokens': response.usage.input_tokens,
-            'output_tokens': response.usage.output_tokens,
-        }
-        cost = (usage['input_tokens'] * 3 + usage['output_tokens'] * 15) / 1_000_000
-        usage['estimated_cost'] = round(cost, 4)
-        logger.info(f"  {label}: {usage['output_tokens']} tokens, ~${cost:.4f}")
+        usage = Usage.from_response(response.usage)
+        logger.info("  %s: %s tokens, ~$%.4f", label, usage.output_tokens, usage.cost())
         return {'content': content, 'usage': usage}
     except Exception as e:
-        logger.error(f"{label} API call failed: {e}")
+        logger.error("%s API call failed: %s", label, e)
         return None
 
 
+_MEDAL_MAP = {'ME_GOLD': 'Gold', 'ME_SILVER': 'Silver', 'ME_BRONZE': 'Bronze'}
+
+
+def _result_line(r):
+    pos = f"#{r['position']}" if r.get('position') else r.get('wlt', '')
+    medal = f" [{_MEDAL_MAP.get(r['medal_type'], r['medal_type'])}]" if r.get('medal_type') else ""
+    return f"{pos} {r['name']} ({r['noc']}) - {r.get('mark', '')}{medal}"
+
+
 def format_results_for_editor(resolved_data):
     """Format results data for prompts."""
-    lines = []
-    for r in resolved_data['results']:
-        medal = ""
-        if r.get('medal_type'):
-            medal_map = {'ME_GOLD': 'Gold', 'ME_SILVER': 'Silver', 'ME_BRONZE': 'Bronze'}
-            medal = f" [{medal_map.get(r['medal_type'], r['medal_type'])}]"
-        pos = f"#{r['position']}" if r.get('position') else (r.get('wlt', ''))
-        lines.append(f"{pos} {r['name']} ({r['noc']}) - {r.get('mark', '')}{medal}")
-    return '\n'.join(lines)
+    return '\n'.join([_result_line(r) for r in resolved_data['results']])
+
+
+def _parse_edit_json(text):
+    """Parse the combined editor's JSON reply; tolerate stray text/code fences around it."""
+    for candidate in (text, *(m.group(0) for m in [_JSON_OBJECT_RE.search(text)] if m)):
+        try:
+            data = json.loads(candidate)
+        except (ValueError, TypeError):
+            continue
+        if isinstance(data, dict) and isinstance(data.get('polished'), str) and data['polished'].strip():
+            return data
+    return None
+
+
+def _parse_batch_json(text):
+    """Parse the batch editor's JSON array into {id: item}; empty dict if unparseable."""
+    for candidate in (text, *(m.group(0) for m in [_JSON_ARRAY_RE.search(text)] if m)):
+        try:
+            data = json.loads(candidate)
+        except (ValueError, TypeError):
+            continue
+        if isinstance(data, list):
+            items = {}
+            for item in data:
+                if not (isinstance(item, dict) and isinstance(item.get('polished'), str)
+                        and item['polished'].strip()):
+                    continue
+                # The model sometimes returns "id": "2"; anything non-numeric is unusable
+                try:
+                    items[int(item['id'])] = item
+                except (KeyError, ValueError, TypeError):
+                    continue
+            return items
+    return {}
+
+
+def _format_issues(issues):
+    """Render the combined editor's issue list in the fact-checker's text format."""
+    if not issues:
+        return "ISSUES: None found"
+    return "ISSUES:\n" + "\n".join(f"- {issue}" for issue in issues)
 
 
 def format_sources_summary(sources_metadata):
     """Brief summary of sources for editor context."""
     if not sources_metadata:
         return "No external sources were available."
-    lines = []
-    for i, s in enumerate(sources_metadata, 1):
-        lines.append(f"Source {i} ({s['domain']}): {s['title']}")
-    return '\n'.join(lines)
+    return '\n'.join([f"Source {i} ({s['domain']}): {s['title']}"
+                      for i, s in enumerate(sources_metadata, 1)])
+
+
+def _context_text(intro, results_text, source_section):
+    """Prompt context: intro line, then the RESULTS and SOURCES sections."""
+    return ''.join([intro, _HDR_RESULTS, results_text, _HDR_SOURCES, source_section, '\n\n'])
+
+
+class _IssueLogger:
+    """
+    on_delta callback for the fact-checker: logs the ISSUES block as soon as the
+    `---` separator streams in, while the corrected text is still being generated.
+    """
+
+    def __init__(self):
+        self.text = ''
+        self.line_start = 0
+        self.done = False
+
+    def __call__(self, text):
+        if self.done:
+            return
+        prev_len = len(self.text)
+        self.text += text
+        # Only the line that was open before this delta (and those after it) can
+        # hold a new separator, so don't rescan the whole output on every delta
+        m = _SPLIT_RE.search(self.text, self.line_start)
+        nl = text.rfind('\n')
+        if nl >= 0:
+            self.line_start = prev_len + nl + 1
+        # Only trust the match once its line has ended (more text has arrived)
+        if m and len(self.text) > m.end():
+            issues = self.text[:m.start()].strip()
+            logger.info("  Fact-check issues (streamed): %s", issues[:200])
+            self.done = True
+            self.text = ''
+
+
+# ============================================================
+# EDIT CACHE (commentary_edit_cache, migration 008)
+# ============================================================
+
+def _cache_key(kind, system_prompt, *parts):
+    """SHA-256 over the model, system prompt and every prompt input."""
+    h = hashlib.sha256()
+    for part in (kind, MODEL, system_prompt, *parts):
+        h.update(part.encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _cache_get(key):
+    """(output, issues) for a cached edit, or None. Cache errors never fail an edit."""
+    try:
+        with pooled_connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT output, issues FROM commentary_edit_cache WHERE cache_key = %s", (key,))
+            return cur.fetchone()
+    except psycopg2.Error as e:
+        logger.warning("  Edit cache lookup failed: %s", e)
+        return None
+
+
+def _cache_put(key, kind, output, issues, usage):
+    try:
+        with pooled_connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO commentary_edit_cache (cache_key, kind, output, issues, usage)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (cache_key) DO NOTHING
+            """, (key, kind, output, issues, json.dumps(asdict(usage))))
+    except psycopg2.Error as e:
+        logger.warning("  Edit cache store failed: %s", e)
 
 
 # ============================================================
@@ -162,21 +393,24 @@ def fact_check(commentary, resolved_data, sources_metadata, consolidated_text=""
     # Give fact-checker the full source articles if available
     source_section = consolidated_text if consolidated_text else sources_summary
 
-    prompt = f"""Fact-check this Olympic commentary.
-
-=== RESULTS (ground truth from official database) ===
-{results_text}
-
-=== SOURCE ARTICLES THE WRITER USED ===
-{source_section}
+    prompt = [
+        _text_block(_context_text(_FACTCHECK_INTRO, results_text, source_section)),
+        _text_block(''.join([_HDR_FACTCHECK, commentary, _FACTCHECK_FOOTER])),
+    ]
 
-=== COMMENTARY TO FACT-CHECK ===
-{commentary}
-
-Check every factual claim now. Classify each as VERIFIED, SOURCED, CONTRADICTS, or UNSOURCED."""
+    key = _cache_key('fact_check', FACTCHECK_SYSTEM, commentary, results_text, source_section)
+    cached = _cache_get(key)
+    if cached:
+        logger.info("  Fact-checker: cache hit")
+        return {
+            'factchecked_content': cached[0],
+            'issues': cached[1] or "",
+            'usage': Usage(),
+            'cache_hit': True,
+        }
 
     logger.info("  Running fact-checker...")
-    result = _call_claude(FACTCHECK_SYSTEM, prompt, "Fact-checker")
+    result = _call_claude(FACTCHECK_SYSTEM, prompt, "Fact-checker", on_delta=_IssueLogger())
     if not result:
         return None
 
@@ -185,12 +419,13 @@ Check every factual claim now. Classify each as VERIFIED, SOURCED, CONTRADICTS,
     # Parse issues and corrected text
     issues = ""
     factchecked_text = full_output
-    
-    if '---' in full_output:
-        parts = full_output.split('---', 1)
-        issues = parts[0].strip()
-        factchecked_text = parts[1].strip()
 
+    m = _SPLIT_RE.search(full_output)
+    if m:
+        issues = full_output[:m.start()].strip()
+        factchecked_text = full_output[m.end():].strip()
+
+    _cache_put(key, 'fact_check', factchecked_text, issues, result['usage'])
     return {
         'factchecked_content': factchecked_text,
         'issues': issues,
@@ -198,37 +433,212 @@ Check every factual claim now. Classify each as VERIFIED, SOURCED, CONTRADICTS,
     }
 
 
+def _is_clean(issues):
+    """True if the fact-checker reported no issues."""
+    return not issues or 'None found' in issues[:40]
+
+
 def prose_edit(commentary):
     """Agent 2: Polish prose without touching facts."""
-    prompt = f"""Polish the prose of this Olympic commentary. Do not change any facts.
+    prompt = _PROSE_INTRO + commentary
 
-{commentary}"""
+    key = _cache_key('prose_edit', PROSE_SYSTEM, commentary)
+    cached = _cache_get(key)
+    if cached:
+        logger.info("  Prose editor: cache hit")
+        return {
+            'polished_content': cached[0],
+            'usage': Usage(),
+            'cache_hit': True,
+        }
 
     logger.info("  Running prose editor...")
     result = _call_claude(PROSE_SYSTEM, prompt, "Prose editor")
     if not result:
         return None
 
+    _cache_put(key, 'prose_edit', result['content'], None, result['usage'])
     return {
         'polished_content': result['content'],
         'usage': result['usage'],
     }
 
 
+def combined_prompt(commentary, resolved_data, sources_metadata, consolidated_text=""):
+    """User content blocks for a combined edit: results + sources, then the commentary."""
+    results_text = format_results_for_editor(resolved_data)
+    source_section = consolidated_text if consolidated_text else format_sources_summary(sources_metadata)
+
+    return [
+        _text_block(_context_text(_COMBINED_INTRO, results_text, source_section)),
+        _text_block(''.join([_HDR_EDIT, commentary, _COMBINED_FOOTER])),
+    ]
+
+
+def parse_combined_result(text, usage, price_factor=1.0):
+    """editor-result dict from a combined edit response, or None if unparseable."""
+    data = _parse_edit_json(text)
+    if not data:
+        logger.warning("  Combined editor returned unparseable output")
+        return None
+
+    issues = [str(i) for i in data.get('issues') or []]
+    return {
+        'proofed_content': data['polished'].strip(),
+        'corrections': _format_issues(issues),
+        'usage': usage,
+        'estimated_cost': usage.cost(price_factor),
+    }
+
+
+def _combined_key(commentary, resolved_data, sources_metadata, consolidated_text=""):
+    """Edit-cache key for a combined edit (shared by the sync, packed and Message Batch paths)."""
+    results_text = format_results_for_editor(resolved_data)
+    source_section = consolidated_text if consolidated_text else format_sources_summary(sources_metadata)
+    return _cache_key('combined', COMBINED_SYSTEM, commentary, results_text, source_section)
+
+
+def _combined_cache_get(key):
+    """editor-result dict for a cached combined edit, or None."""
+    cached = _cache_get(key)
+    if not cached:
+        return None
+    return {
+        'proofed_content': cached[0],
+        'corrections': cached[1] or "",
+        'usage': Usage(),
+        'estimated_cost': 0,
+        'cache_hit': True,
+    }
+
+
+def _combined_cache_put(key, result):
+    _cache_put(key, 'combined', result['proofed_content'], result['corrections'], result['usage'])
+
+
+def combined_edit(commentary, resolved_data, sources_metadata, consolidated_text=""):
+    """Fact-check and prose-edit in a single call. Returns None if the call or parse fails."""
+    key = _combined_key(commentary, resolved_data, sources_metadata, consolidated_text)
+    cached = _combined_cache_get(key)
+    if cached:
+        logger.info("  Editor: cache hit")
+        return cached
+
+    prompt = combined_prompt(commentary, resolved_data, sources_metadata, consolidated_text)
+
+    logger.info("  Running combined fact-check + prose edit...")
+    result = _call_claude(COMBINED_SYSTEM, prompt, "Editor", max_tokens=COMBINED_MAX_TOKENS)
+    if not result:
+        return None
+
+    edited = parse_combined_result(result['content'], result['usage'])
+    if edited:
+        _combined_cache_put(key, edited)
+    return edited
+
+
+def _edit_prompt_section(event):
+    """RESULTS / SOURCES / COMMENTARY block for one event in a batch request."""
+    results_text = format_results_for_editor(event['resolved_data'])
+    source_section = event.get('consolidated_text') or format_sources_summary(event['sources_metadata'])
+    return ''.join([_HDR_RESULTS.lstrip('\n'), results_text, _HDR_SOURCES, source_section,
+                    '\n\n', _HDR_EDIT, event['commentary']])
+
+
+def _pack_batches(sections, batch_size):
+    """Group (index, section) pairs by count and by estimated input tokens."""
+    batch, batch_tokens = [], 0
+    for i, section in sections:
+        tokens = estimate_tokens(section)
+        if batch and (len(batch) >= batch_size or batch_tokens + tokens > MAX_BATCH_INPUT_TOKENS):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append((i, section))
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+
+def _edit_batch(events, batch, keys):
+    """One Claude call for several events; None entries for events it didn't return."""
+    if len(batch) == 1:
+        i, _ = batch[0]
+        return {i: combined_edit(events[i]['commentary'], events[i]['resolved_data'],
+                                 events[i]['sources_metadata'], events[i].get('consolidated_text', ''))}
+
+    prompt = "Fact-check, then polish, each of these Olympic commentaries.\n\n" + "\n\n".join(
+        f"=== EVENT {n} ===\n{section}" for n, (_, section) in enumerate(batch, 1)
+    ) + "\n\nReturn the JSON array now, one object per event, using the EVENT numbers as ids."
+
+    logger.info("  Running batch editor on %s events...", len(batch))
+    result = _call_claude(BATCH_SYSTEM, prompt, "Batch editor",
+                          max_tokens=COMBINED_MAX_TOKENS * len(batch))
+    if not result:
+        return {i: None for i, _ in batch}
+
+    items = _parse_batch_json(result['content'])
+    # Usage is per request; attribute an equal share to each event
+    share = result['usage'].share(len(batch))
+    edited = {}
+    for n, (i, _) in enumerate(batch, 1):
+        item = items.get(n)
+        edited[i] = {
+            'proofed_content': item['polished'].strip(),
+            'corrections': _format_issues([str(x) for x in item.get('issues') or []]),
+            'usage': share,
+            'estimated_cost': share.cost(),
+        } if item else None
+        if edited[i]:
+            _combined_cache_put(keys[i], edited[i])
+    return edited
+
+
+def batch_edit_commentary(events, batch_size=EDIT_BATCH_SIZE):
+    """
+    Edit several events' commentary, packing up to batch_size of them (and at most
+    MAX_BATCH_INPUT_TOKENS of input) into each Claude request so the system prompt
+    and round-trip are shared. Each event is a dict with commentary, resolved_data,
+    sources_metadata and consolidated_text.
+
+    Returns edit_commentary-shaped results in input order. Events already in the
+    edit cache are not sent; events a batch reply omitted are retried individually
+    through edit_commentary.
+    """
+    keys = [_combined_key(e['commentary'], e['resolved_data'], e['sources_metadata'],
+                          e.get('consolidated_text', '')) for e in events]
+    edited = {i: _combined_cache_get(k) for i, k in enumerate(keys)}
+    sections = [(i, _edit_prompt_section(e)) for i, e in enumerate(events) if not edited[i]]
+    for batch in _pack_batches(sections, batch_size):
+        edited.update(_edit_batch(events, batch, keys))
+
+    results = []
+    for i, event in enumerate(events):
+        result = edited.get(i)
+        if not result:
+            result = edit_commentary(event['commentary'], event['resolved_data'],
+                                     event['sources_metadata'], event.get('consolidated_text', ''))
+        results.append(result)
+    return results
+
+
 # ============================================================
 # MAIN ENTRY POINT (called by pipeline_orchestrator)
 # ============================================================
 
 def edit_commentary(commentary, resolved_data, sources_metadata, consolidated_text=""):
     """
-    Two-pass editing pipeline:
-      1. Fact-checker validates claims
-      2. Prose editor polishes writing
-    
+    Fact-check + prose-edit pipeline. Runs both steps in one combined call; if that
+    fails, falls back to the two-agent path (fact_check, then prose_edit).
+
     Returns same shape as old single-editor for orchestrator compatibility:
     {proofed_content, corrections, usage, estimated_cost}
     """
-    logger.info("Starting two-agent edit pipeline...")
+    combined = combined_edit(commentary, resolved_data, sources_metadata, consolidated_text)
+    if combined:
+        logger.info("  Edit complete. Edit cost: $%.4f", combined['estimated_cost'])
+        return combined
+
+    logger.info("Falling back to two-agent edit pipeline...")
 
     # Pass 1: Fact-check
     fc_result = fact_check(commentary, resolved_data, sources_metadata, consolidated_text)
@@ -237,10 +647,21 @@ def edit_commentary(commentary, resolved_data, sources_metadata, consolidated_te
         return {
             'proofed_content': commentary,
             'corrections': 'Fact-checker failed',
-            'usage': {},
+            'usage': Usage(),
             'estimated_cost': 0,
         }
 
+    # Clean, short pieces don't need the prose pass
+    if (not FORCE_PROSE_EDIT and _is_clean(fc_result['issues'])
+            and len(fc_result['factchecked_content'].split()) < PROSE_SKIP_MAX_WORDS):
+        logger.info("  No fact-check issues, skipping prose editor")
+        return {
+            'proofed_content': fc_result['factchecked_content'],
+            'corrections': fc_result['issues'],
+            'usage': fc_result['usage'],
+            'estimated_cost': fc_result['usage'].cost(),
+        }
+
     # Pass 2: Prose edit (on fact-checked version)
     pe_result = prose_edit(fc_result['factchecked_content'])
     if not pe_result:
@@ -249,42 +670,26 @@ def edit_commentary(commentary, resolved_data, sources_metadata, consolidated_te
             'proofed_content': fc_result['factchecked_content'],
             'corrections': fc_result['issues'],
             'usage': fc_result['usage'],
-            'estimated_cost': fc_result['usage'].get('estimated_cost', 0),
+            'estimated_cost': fc_result['usage'].cost(),
         }
 
-    # Combine costs
-    total_cost = (
-        fc_result['usage'].get('estimated_cost', 0) + 
-        pe_result['usage'].get('estimated_cost', 0)
-    )
-
-    total_usage = {
-        'fact_checker': fc_result['usage'],
-        'prose_editor': pe_result['usage'],
-        'total_input_tokens': (
-            fc_result['usage'].get('input_tokens', 0) + 
-            pe_result['usage'].get('input_tokens', 0)
-        ),
-        'total_output_tokens': (
-            fc_result['usage'].get('output_tokens', 0) + 
-            pe_result['usage'].get('output_tokens', 0)
-        ),
-    }
+    total_usage = fc_result['usage'] + pe_result['usage']
+    total_cost = total_usage.cost()
 
-    logger.info(f"  Edit pipeline complete. Total edit cost: ${total_cost:.4f}")
+    logger.info("  Edit pipeline complete. Total edit cost: $%.4f", total_cost)
     if fc_result['issues']:
-        logger.info(f"  Fact-check issues: {fc_result['issues'][:200]}")
+        logger.info("  Fact-check issues: %s", fc_result['issues'][:200])
 
     return {
         'proofed_content': pe_result['polished_content'],
         'corrections': fc_result['issues'],
         'usage': total_usage,
-        'estimated_cost': round(total_cost, 4),
+        'estimated_cost': total_cost,
     }
 
 
 if __name__ == '__main__':
-    print("Commentary Editor - Two-agent pipeline")
-    print("  Agent 1: Fact-checker (validates claims)")
-    print("  Agent 2: Prose editor (polishes writing)")
+    print("Commentary Editor - Fact-check + prose-edit pipeline")
+    print("  Combined: one call, JSON {issues, polished}")
+    print("  Fallback: Agent 1 fact-checker, then Agent 2 prose editor")
     print("Normally called via pipeline_orchestrator.py")
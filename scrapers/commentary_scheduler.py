@@ -19,26 +19,45 @@ load_dotenv()
 
 import os
 import sys
+import asyncio
 import psycopg2
+from psycopg2.extras import RealDictCursor, execute_values
+from db_pool import pooled_connection
+from concurrency import gather_bounded
 import logging
 import argparse
+import re
 import json
+import time
 import requests
+from pathlib import Path
+from collections import Counter
+from itertools import chain
 from datetime import datetime, timedelta, timezone
 
+try:
+    # Rust parser, several times faster than json on the multi-MB schedule payload
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
-DB_CONFIG = {
-    'host': os.getenv('DB_HOST', '127.0.0.1'),
-    'port': int(os.getenv('DB_PORT', '5432')),
-    'database': os.getenv('DB_NAME', 'olympics_tv'),
-    'user': os.getenv('DB_USER'),
-    'password': os.getenv('DB_PASSWORD')
-}
+# Training runs / practice sessions get no pre-event commentary
+_SKIP_RE = re.compile(r'training|practice|warm', re.I)
+# Post-event runs with at least this many events edit via the Message Batches API
+MESSAGE_BATCH_MIN_EVENTS = int(os.getenv('MESSAGE_BATCH_MIN_EVENTS', '4'))
+# An event whose commentary row went 'scraping'/'writing' this recently is
+# claimed by a run still in progress (a Message Batch can wait up to
+# EDIT_BATCH_MAX_WAIT_SECONDS); older claims are from crashed runs and expire
+CLAIM_LEASE_SECONDS = int(os.getenv(
+    'COMMENTARY_CLAIM_LEASE_SECONDS',
+    str(int(os.getenv('EDIT_BATCH_MAX_WAIT_SECONDS', str(2 * 60 * 60))) + 30 * 60),
+))
 
 OLYMPICS_API_BASE = "https://www.olympics.com/wmr-owg2026/schedules/api/ENG/schedule/lite/day"
 HEADERS = {
@@ -46,24 +65,55 @@ HEADERS = {
     'Referer': 'https://www.olympics.com/'
 }
 
+# Keep-alive session reused by every Olympics.com request in this process
+_SESSION = requests.Session()
+_SESSION.headers.update(HEADERS)
+
+# Schedule JSON younger than this is reused from disk instead of re-downloaded
+# (scheduler runs can be minutes apart); 0 disables the cache
+SCHEDULE_CACHE_TTL = int(os.getenv('SCHEDULE_CACHE_TTL', '300'))
+SCHEDULE_CACHE_DIR = Path(__file__).parent.parent / 'raw_data'
+
+
+def fetch_today_schedule(now=None):
+    """Fetch today's schedule from Olympics API (cached on disk for SCHEDULE_CACHE_TTL seconds)"""
+    today = (now or datetime.now(timezone.utc)).strftime('%Y-%m-%d')
+    cache_file = SCHEDULE_CACHE_DIR / f"schedule_cache_{today.replace('-', '')}.json"
+
+    if SCHEDULE_CACHE_TTL > 0:
+        try:
+            age = time.time() - cache_file.stat().st_mtime
+            if age < SCHEDULE_CACHE_TTL:
+                logger.info("Using cached schedule for %s (%.0fs old)", today, age)
+                return _json_loads(cache_file.read_bytes())
+        except (OSError, ValueError):
+            pass  # missing, unreadable or half-written: fetch instead
 
-def fetch_today_schedule():
-    """Fetch today's schedule from Olympics API"""
-    today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
     url = f"{OLYMPICS_API_BASE}/{today}"
-    logger.info(f"Fetching results from Olympics.com for {today}")
+    logger.info("Fetching results from Olympics.com for %s", today)
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
+        response = _SESSION.get(url, timeout=15)
         response.raise_for_status()
-        return response.json()
+        data = _json_loads(response.content)
     except Exception as e:
-        logger.error(f"Failed to fetch schedule: {e}")
+        logger.error("Failed to fetch schedule: %s", e)
         return None
 
+    if SCHEDULE_CACHE_TTL > 0:
+        try:
+            SCHEDULE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Write then rename so a concurrent run never reads a partial file
+            tmp_file = cache_file.with_suffix('.tmp')
+            tmp_file.write_bytes(response.content)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning("Could not cache schedule: %s", e)
+
+    return data
+
 
 def extract_results(unit):
-    """Extract result rows from a single unit's competitors"""
-    results = []
+    """Yield result rows from a single unit's competitors"""
     event_unit_code = unit['id'].rstrip('-')
 
     for c in unit.get('competitors', []):
@@ -85,7 +135,7 @@ def extract_results(unit):
         if wlt:
             wlt = wlt[0]
 
-        results.append((
+        yield (
             event_unit_code,
             code,
             c.get('noc'),
@@ -94,13 +144,12 @@ def extract_results(unit):
             r.get('mark'),
             wlt,
             r.get('medalType')
-        ))
-    return results
+        )
 
 
-def populate_results():
+def populate_results(now=None):
     """Fetch today's results from Olympics.com and populate results table"""
-    data = fetch_today_schedule()
+    data = fetch_today_schedule(now)
     if not data:
         logger.info("No schedule data received")
         return
@@ -110,210 +159,319 @@ def populate_results():
         logger.info("No units in schedule")
         return
 
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor()
-
-    # Get existing result units
-    cur.execute("SELECT DISTINCT event_unit_code FROM results")
-    existing = {row[0] for row in cur.fetchall()}
-
-    new_results = 0
-    new_events = []
-
-    for unit in units:
-        if unit.get('status') != 'FINISHED':
-            continue
+    # Most ticks before the day's first finish have nothing to insert;
+    # skip the pooled connection and the empty transaction entirely
+    finished = [unit for unit in units if unit.get('status') == 'FINISHED']
+    if not finished:
+        logger.info("No finished units in schedule")
+        return
 
-        event_unit_code = unit['id'].rstrip('-')
+    with pooled_connection() as conn:
+        _insert_results(conn, finished)
 
-        # Skip if we already have results for this event
-        if event_unit_code in existing:
-            continue
 
-        results = extract_results(unit)
-        if not results:
-            continue
+def _insert_results(conn, units):
+    """Insert finished units' results; rows already in the table are skipped by ON CONFLICT"""
+    cur = conn.cursor()
 
-        for row in results:
-            try:
-                cur.execute("""
-                    INSERT INTO results (event_unit_code, competitor_code, noc,
-                        competitor_name, position, mark, winner_loser_tie,
-                        medal_type, detected_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())
-                    ON CONFLICT (event_unit_code, competitor_code) DO NOTHING
-                """, row)
-                new_results += 1
-            except Exception as e:
-                logger.error(f"Insert error {row[0]}/{row[1]}: {e}")
-                conn.rollback()
-                continue
+    # Rows stream straight into execute_values' pages; no intermediate list
+    rows = chain.from_iterable(extract_results(unit) for unit in units)
 
-        new_events.append(event_unit_code)
-        logger.info(f"  NEW RESULTS: {event_unit_code} ({len(results)} competitors)")
+    # One multi-row INSERT per 500 rows instead of a round-trip per row;
+    # RETURNING reports which rows were actually new
+    try:
+        inserted = execute_values(cur, """
+            INSERT INTO results (event_unit_code, competitor_code, noc,
+                competitor_name, position, mark, winner_loser_tie,
+                medal_type, detected_at)
+            VALUES %s
+            ON CONFLICT (event_unit_code, competitor_code) DO NOTHING
+            RETURNING event_unit_code
+        """, rows, template="(%s, %s, %s, %s, %s, %s, %s, %s, NOW())",
+            page_size=500, fetch=True)
+    except psycopg2.Error as e:
+        logger.error("Results insert failed: %s", e)
+        conn.rollback()
+        inserted = []
 
     conn.commit()
     cur.close()
-    conn.close()
 
-    logger.info(f"Results: {len(new_events)} new events, {new_results} result rows added")
+    new_events = Counter(row[0] for row in inserted)
+    for event_unit_code, count in new_events.items():
+        logger.info("  NEW RESULTS: %s (%s competitors)", event_unit_code, count)
 
+    logger.info("Results: %s new events, %s result rows added", len(new_events), len(inserted))
 
-def get_post_event_pending():
-    """Find events with results in the last 24 hours without post_event commentary. Excludes training."""
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor()
 
-    cur.execute("""
-        SELECT DISTINCT su.event_unit_code, d.name as discipline,
-               e.name as event, su.medal_flag, su.start_time, su.event_unit_name
-        FROM schedule_units su
-        JOIN events e ON su.event_id = e.event_id
-        JOIN disciplines d ON e.discipline_code = d.code
-        JOIN results r ON r.event_unit_code = su.event_unit_code
-        LEFT JOIN commentary c
-            ON c.event_unit_code = su.event_unit_code
-            AND c.commentary_type = 'post_event'
-            AND c.content IS NOT NULL
-        WHERE su.start_time >= NOW() - INTERVAL '24 hours'
-        AND LOWER(su.event_unit_name) NOT LIKE '%training%'
-        AND LOWER(su.event_unit_name) NOT LIKE '%practice%'
-        AND LOWER(su.event_unit_name) NOT LIKE '%warm%'
-        AND c.id IS NULL
-        ORDER BY su.medal_flag DESC, su.start_time
-    """)
-
-    events = [{
-        'event_unit_code': row[0],
-        'discipline': row[1],
-        'event': row[2],
-        'medal_flag': row[3],
-        'start_time': row[4],
-        'unit_name': row[5],
-    } for row in cur.fetchall()]
+# Pending-event queries share one column list so they can also run together
+# (get_pending) as a single UNION ALL round trip; the kind column tags each row.
+# Every join is to a parent row, so each schedule unit appears once (no DISTINCT)
+_PENDING_COLUMNS = (
+    "su.event_unit_code, d.name as discipline, e.name as event, "
+    "su.event_unit_name as unit_name, su.medal_flag, su.start_time, su.status"
+)
 
-    cur.close()
-    conn.close()
-    return events
+_POST_PENDING_SQL = f"""
+    SELECT {_PENDING_COLUMNS}, 'post' as kind
+    FROM schedule_units su
+    JOIN events e ON su.event_id = e.event_id
+    JOIN disciplines d ON e.discipline_code = d.code
+    WHERE su.start_time >= %(now)s - INTERVAL '24 hours'
+    AND EXISTS (SELECT 1 FROM results r WHERE r.event_unit_code = su.event_unit_code)
+    AND LOWER(su.event_unit_name) NOT LIKE '%%training%%'
+    AND LOWER(su.event_unit_name) NOT LIKE '%%practice%%'
+    AND LOWER(su.event_unit_name) NOT LIKE '%%warm%%'
+    AND NOT EXISTS (
+        SELECT 1 FROM commentary c
+        WHERE c.event_unit_code = su.event_unit_code
+        AND c.commentary_type = 'post_event'
+        AND c.content IS NOT NULL
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM commentary c
+        WHERE c.event_unit_code = su.event_unit_code
+        AND c.commentary_type = 'post_event'
+        AND c.status IN ('scraping', 'writing')
+        AND c.updated_at > %(now)s - %(lease)s * INTERVAL '1 second'
+    )
+"""
+
+_PRE_PENDING_SQL = f"""
+    SELECT {_PENDING_COLUMNS}, 'pre' as kind
+    FROM schedule_units su
+    JOIN events e ON su.event_id = e.event_id
+    JOIN disciplines d ON e.discipline_code = d.code
+    WHERE su.start_time > %(now)s
+    AND su.start_time <= %(now)s + INTERVAL '24 hours'
+    AND LOWER(su.event_unit_name) NOT LIKE '%%training%%'
+    AND LOWER(su.event_unit_name) NOT LIKE '%%practice%%'
+    AND LOWER(su.event_unit_name) NOT LIKE '%%warm%%'
+    AND NOT EXISTS (
+        SELECT 1 FROM commentary c
+        WHERE c.event_unit_code = su.event_unit_code
+        AND c.commentary_type = 'pre_event'
+        AND c.content IS NOT NULL
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM commentary c
+        WHERE c.event_unit_code = su.event_unit_code
+        AND c.commentary_type = 'pre_event'
+        AND c.status IN ('scraping', 'writing')
+        AND c.updated_at > %(now)s - %(lease)s * INTERVAL '1 second'
+    )
+"""
 
+_PENDING_ORDER = "ORDER BY medal_flag DESC, start_time"
 
-def get_pre_event_pending():
-    """Find upcoming events in the next 24 hours without pre_event commentary. Excludes training."""
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor()
 
-    cur.execute("""
-        SELECT DISTINCT su.event_unit_code, d.name as discipline,
-               e.name as event, su.event_unit_name, su.medal_flag,
-               su.start_time, su.status
-        FROM schedule_units su
-        JOIN events e ON su.event_id = e.event_id
-        JOIN disciplines d ON e.discipline_code = d.code
-        LEFT JOIN commentary c
-            ON c.event_unit_code = su.event_unit_code
-            AND c.commentary_type = 'pre_event'
-            AND c.content IS NOT NULL
-        WHERE su.start_time > NOW()
-        AND su.start_time <= NOW() + INTERVAL '24 hours'
-        AND LOWER(su.event_unit_name) NOT LIKE '%training%'
-        AND LOWER(su.event_unit_name) NOT LIKE '%practice%'
-        AND LOWER(su.event_unit_name) NOT LIKE '%warm%'
-        AND c.id IS NULL
-        ORDER BY su.medal_flag DESC, su.start_time
-    """)
-
-    events = [{
-        'event_unit_code': row[0],
-        'discipline': row[1],
-        'event': row[2],
-        'unit_name': row[3],
-        'medal_flag': row[4],
-        'start_time': row[5],
-        'status': row[6],
-    } for row in cur.fetchall()]
+def _fetch_pending(sql, now=None):
+    """
+    Run a pending-events query; rows come back as dicts. now is bound as a
+    constant (so one scheduler run uses one timestamp), defaulting to the current time.
+    Events claimed by another run (see CLAIM_LEASE_SECONDS) are left out.
+    """
+    with pooled_connection() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(sql, {'now': now or datetime.now(timezone.utc), 'lease': CLAIM_LEASE_SECONDS})
+        return cur.fetchall()
 
-    cur.close()
-    conn.close()
-    return events
 
+def _renew_claims(event_unit_codes, commentary_type):
+    """Restart the claim lease on events about to wait on another Message Batch"""
+    try:
+        with pooled_connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                UPDATE commentary SET updated_at = NOW()
+                WHERE event_unit_code = ANY(%s) AND commentary_type = %s
+                AND status IN ('scraping', 'writing')
+            """, (list(event_unit_codes), commentary_type))
+    except psycopg2.Error as e:
+        # Worst case an overlapping run picks the events up again; not worth aborting for
+        logger.warning("Could not renew claims on %s events: %s", len(event_unit_codes), e)
+
+
+def get_post_event_pending(now=None):
+    """Find events with results in the last 24 hours without post_event commentary. Excludes training."""
+    return _fetch_pending(f"{_POST_PENDING_SQL} {_PENDING_ORDER}", now)
 
-def run_post_events(dry_run=False):
-    """Generate post-event commentary for recent finished events."""
-    from pipeline_orchestrator import process_event, update_commentary_status
 
-    events = get_post_event_pending()
+def get_pre_event_pending(now=None):
+    """Find upcoming events in the next 24 hours without pre_event commentary. Excludes training."""
+    return _fetch_pending(f"{_PRE_PENDING_SQL} {_PENDING_ORDER}", now)
+
+
+def get_pending(now=None):
+    """Post- and pre-event pending lists from one query (one round trip, one plan)"""
+    rows = _fetch_pending(f"{_POST_PENDING_SQL} UNION ALL {_PRE_PENDING_SQL} ORDER BY kind, medal_flag DESC, start_time", now)
+    post = [row for row in rows if row['kind'] == 'post']
+    pre = [row for row in rows if row['kind'] == 'pre']
+    return post, pre
+
+
+def _log_event(evt, with_time=False):
+    """One listing line per event, logged as its work starts (or by a dry run)"""
+    medal = "[MEDAL]" if evt['medal_flag'] else "      "
+    if with_time:
+        logger.info("  %s %s - %s @ %s", medal, evt['discipline'], evt['event'], evt['start_time'])
+    else:
+        logger.info("  %s %s - %s", medal, evt['discipline'], evt['event'])
+
+
+def run_post_events(dry_run=False, events=None):
+    """
+    Generate post-event commentary for recent finished events. events, if
+    given, is a get_post_event_pending() result fetched ahead of time.
+    Resolve/scrape runs concurrently per event. Runs with at least
+    MESSAGE_BATCH_MIN_EVENTS events then write and edit through the Message
+    Batches API (half price, no rate-limit pressure); smaller runs write per
+    event and pack several events into each synchronous edit request
+    (batch_edit_commentary).
+    """
+    from pipeline_orchestrator import (
+        scrape_event, write_event, prepare_event, finish_event, update_commentary_status,
+    )
+    from commentary_editor import batch_edit_commentary, EDIT_BATCH_SIZE
+    from commentary_batch import batch_write_jobs, batch_edit_jobs
+
+    if events is None:
+        events = get_post_event_pending()
     medal_count = sum(1 for e in events if e['medal_flag'])
 
-    logger.info(f"POST-EVENT: {len(events)} pending ({medal_count} medal)")
+    logger.info("POST-EVENT: %s pending (%s medal)", len(events), medal_count)
 
     if not events:
         logger.info("POST-EVENT: Nothing to process")
         return 0, 0
 
-    for evt in events:
-        medal = "[MEDAL]" if evt['medal_flag'] else "      "
-        logger.info(f"  {medal} {evt['discipline']} - {evt['event']}")
-
     if dry_run:
+        for evt in events:
+            _log_event(evt)
         return 0, 0
 
     success = 0
     failed = 0
 
-    for evt in events:
-        try:
-            ok = process_event(evt['event_unit_code'], commentary_type='post_event')
-            if ok:
-                success += 1
+    def fail(event_unit_code, error):
+        logger.error("Error processing %s: %s", event_unit_code, error)
+        update_commentary_status(event_unit_code, 'failed', str(error)[:500], 'post_event')
+
+    use_batches = len(events) >= MESSAGE_BATCH_MIN_EVENTS
+
+    def collect(outcomes, items):
+        """Keep successful jobs; record failures"""
+        nonlocal failed
+        jobs = []
+        for evt, job in zip(items, outcomes):
+            if isinstance(job, Exception):
+                fail(evt['event_unit_code'], job)
+                failed += 1
+            elif not job:
+                failed += 1
             else:
+                jobs.append(job)
+        return jobs
+
+    if use_batches:
+        # Steps 1-2 (resolve → scrape) concurrently, then step 3 as one writer batch
+        def start(evt):
+            _log_event(evt)
+            return scrape_event(evt['event_unit_code'], commentary_type='post_event')
+
+        scraped = collect(asyncio.run(gather_bounded(start, events)), events)
+        written = batch_write_jobs(scraped) if scraped else []
+        # Per-event capture, as gather_bounded does: one DB error must not abort
+        # the run after the writer batch has been paid for
+        def write(job, result):
+            try:
+                return write_event(job, result)
+            except Exception as e:
+                return e
+
+        jobs = collect([write(job, result) for job, result in zip(scraped, written)], scraped)
+    else:
+        # Steps 1-3 (resolve → scrape → write), concurrently across events
+        def start(evt):
+            _log_event(evt)
+            return prepare_event(evt['event_unit_code'], commentary_type='post_event')
+
+        jobs = collect(asyncio.run(gather_bounded(start, events)), events)
+
+    # Step 4: edit. Large runs go through one Message Batch; otherwise
+    # several events per request, requests in parallel
+    if use_batches:
+        chunks = [jobs]
+        if jobs:
+            _renew_claims([j['event_unit_code'] for j in jobs], 'post_event')
+        edited = [batch_edit_jobs(jobs) if jobs else []]
+    else:
+        chunks = [jobs[i:i + EDIT_BATCH_SIZE] for i in range(0, len(jobs), EDIT_BATCH_SIZE)]
+        edited = asyncio.run(gather_bounded(batch_edit_commentary, chunks))
+
+    # Step 5: store (an editor failure stores the unproofed text)
+    for chunk, results in zip(chunks, edited):
+        if isinstance(results, Exception):
+            logger.error("Batch edit failed: %s", results)
+            results = [None] * len(chunk)
+        for job, editor_result in zip(chunk, results):
+            try:
+                finish_event(job, editor_result)
+                success += 1
+            except Exception as e:
+                fail(job['event_unit_code'], e)
                 failed += 1
-        except Exception as e:
-            logger.error(f"Error processing {evt['event_unit_code']}: {e}")
-            update_commentary_status(evt['event_unit_code'], 'failed', str(e)[:500], 'post_event')
-            failed += 1
 
     return success, failed
 
 
-def run_pre_events(dry_run=False):
-    """Generate pre-event commentary for upcoming events."""
-    from intro_orchestrator import process_event, update_status
+def run_pre_events(dry_run=False, events=None):
+    """
+    Generate pre-event commentary for upcoming events. events, if given, is a
+    get_pre_event_pending() result fetched ahead of time.
+    """
+    from intro_orchestrator import process_events, update_status
+
+    if events is None:
+        events = get_pre_event_pending()
+
+    # Skip training runs and practice sessions (before listing, so a dry run
+    # shows exactly what would be processed)
+    todo = []
+    for evt in events:
+        if evt.get('unit_name') and _SKIP_RE.search(evt['unit_name']):
+            logger.info("  Skipping %s (training/practice)", evt['event_unit_code'])
+            continue
+        todo.append(evt)
+    events = todo
 
-    events = get_pre_event_pending()
     medal_count = sum(1 for e in events if e['medal_flag'])
 
-    logger.info(f"PRE-EVENT: {len(events)} pending ({medal_count} medal)")
+    logger.info("PRE-EVENT: %s pending (%s medal)", len(events), medal_count)
 
     if not events:
         logger.info("PRE-EVENT: Nothing to process")
         return 0, 0
 
-    for evt in events:
-        medal = "[MEDAL]" if evt['medal_flag'] else "      "
-        logger.info(f"  {medal} {evt['discipline']} - {evt['event']} @ {evt['start_time']}")
-
     if dry_run:
+        for evt in events:
+            _log_event(evt, with_time=True)
         return 0, 0
 
     success = 0
     failed = 0
 
-    for evt in events:
-        # Skip training runs and practice sessions
-        unit_name = (evt.get('unit_name') or '').lower()
-        if any(skip in unit_name for skip in ['training', 'practice', 'warm']):
-            logger.info(f"  Skipping {evt['event_unit_code']} (training/practice)")
-            continue
+    # Each event's source lookups + writer/editor calls overlap with the others';
+    # all Claude calls share rate_limiter.LIMITER across the worker threads.
+    # Large runs write through one Message Batch (see process_events)
+    outcomes = process_events(events, on_start=lambda evt: _log_event(evt, with_time=True))
 
-        try:
-            ok = process_event(evt)
-            if ok:
-                success += 1
-            else:
-                failed += 1
-        except Exception as e:
-            logger.error(f"Error processing {evt['event_unit_code']}: {e}")
-            update_status(evt['event_unit_code'], 'failed', str(e)[:500])
+    for evt, ok in zip(events, outcomes):
+        if isinstance(ok, Exception):
+            logger.error("Error processing %s: %s", evt['event_unit_code'], ok)
+            update_status(evt['event_unit_code'], 'failed', str(ok)[:500])
+            failed += 1
+        elif ok:
+            success += 1
+        else:
             failed += 1
 
     return success, failed
@@ -329,13 +487,15 @@ if __name__ == '__main__':
 
     logger.info("=" * 60)
     logger.info("COMMENTARY SCHEDULER")
-    logger.info(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    # One timestamp for the whole run: the schedule date and every pending window
+    now = datetime.now(timezone.utc)
+    logger.info("Time: %s", now.astimezone().strftime('%Y-%m-%d %H:%M:%S'))
     logger.info("=" * 60)
 
     # Step 1: Populate results before generating commentary
     logger.info("")
     logger.info("--- Populating Results ---")
-    populate_results()
+    populate_results(now)
 
     run_post = not args.pre_only
     run_pre = not args.post_only
@@ -343,19 +503,28 @@ if __name__ == '__main__':
     post_success, post_failed = 0, 0
     pre_success, pre_failed = 0, 0
 
+    # Pending lists up front (both in one round trip). Post-event work never
+    # writes pre_event commentary, so the pre list stays valid while it runs
+    if run_post and run_pre:
+        post_pending, pre_pending = get_pending(now)
+    elif run_post:
+        post_pending, pre_pending = get_post_event_pending(now), None
+    else:
+        post_pending, pre_pending = None, get_pre_event_pending(now)
+
     if run_post:
         logger.info("")
         logger.info("--- Post-Event (last 24 hours) ---")
-        post_success, post_failed = run_post_events(dry_run=args.dry_run)
+        post_success, post_failed = run_post_events(dry_run=args.dry_run, events=post_pending)
 
     if run_pre:
         logger.info("")
         logger.info("--- Pre-Event (next 24 hours) ---")
-        pre_success, pre_failed = run_pre_events(dry_run=args.dry_run)
+        pre_success, pre_failed = run_pre_events(dry_run=args.dry_run, events=pre_pending)
 
     logger.info("")
     logger.info("=" * 60)
     logger.info("SUMMARY")
-    logger.info(f"  Post-event: {post_success} success, {post_failed} failed")
-    logger.info(f"  Pre-event:  {pre_success} success, {pre_failed} failed")
+    logger.info("  Post-event: %s success, %s failed", post_success, post_failed)
+    logger.info("  Pre-event:  %s success, %s failed", pre_success, pre_failed)
     logger.info("=" * 60)
@@ -12,6 +12,8 @@ import json
 import logging
 import anthropic
 
+from rate_limiter import create_message
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -19,6 +21,12 @@ ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
 MODEL = "claude-sonnet-4-20250514"
 PROMPT_VERSION = "v3"
 
+# One client per process so every event reuses its pooled HTTPS connections
+_CLIENT = (
+    anthropic.Anthropic(api_key=ANTHROPIC_API_KEY, max_retries=0)
+    if ANTHROPIC_API_KEY and ANTHROPIC_API_KEY != 'your_key_here' else None
+)
+
 SYSTEM_PROMPT = """You are a sports journalist writing post-event commentary for the 2026 Milan-Cortina Winter Olympics. Your audience is English-speaking fans, primarily American but with international appeal.
 
 WRITING STYLE:
@@ -46,11 +54,53 @@ CRITICAL RULES:
 """
 
 
-USER_PROMPT_TEMPLATE = """Write post-event commentary for the following Olympic event. Use the results as ground truth and the source articles for narrative color and context.
-
-{consolidated_text}
-
-Write the commentary now. Output ONLY the commentary text, no headers or metadata."""
+# Sent as separate content blocks around the consolidated text, so the
+# multi-KB source dump is never scanned or copied by str.format
+USER_PROMPT_INTRO = "Write post-event commentary for the following Olympic event. Use the results as ground truth and the source articles for narrative color and context."
+USER_PROMPT_OUTRO = "Write the commentary now. Output ONLY the commentary text, no headers or metadata."
+
+
+def writer_params(consolidated_text):
+    """messages.create parameters for one event (shared by the sync and batch paths)."""
+    return {
+        'model': MODEL,
+        'max_tokens': 2048,
+        # Identical for every event; cached once it clears the model's minimum cacheable length
+        'system': [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}],
+        'messages': [
+            {"role": "user", "content": [
+                {"type": "text", "text": USER_PROMPT_INTRO},
+                {"type": "text", "text": consolidated_text},
+                {"type": "text", "text": USER_PROMPT_OUTRO},
+            ]}
+        ],
+    }
+
+
+def writer_result(response, price_factor=1.0):
+    """{content, usage} from a writer response; price_factor 0.5 for the Message Batches API."""
+    usage = {
+        'input_tokens': response.usage.input_tokens,
+        'output_tokens': response.usage.output_tokens,
+        'cache_read_input_tokens': response.usage.cache_read_input_tokens or 0,
+        'cache_creation_input_tokens': response.usage.cache_creation_input_tokens or 0,
+        'model': MODEL,
+        'prompt_version': PROMPT_VERSION,
+    }
+
+    # Rough cost calc (Sonnet pricing per M: $3 input, $3.75 cache write, $0.30 cache read, $15 output)
+    cost = (
+        usage['input_tokens'] * 3
+        + usage['cache_creation_input_tokens'] * 3.75
+        + usage['cache_read_input_tokens'] * 0.3
+        + usage['output_tokens'] * 15
+    ) * price_factor / 1_000_000
+    usage['estimated_cost'] = round(cost, 4)
+
+    return {
+        'content': response.content[0].text,
+        'usage': usage,
+    }
 
 
 def write_commentary(consolidated_text):
@@ -58,45 +108,17 @@ def write_commentary(consolidated_text):
     Send consolidated source file to Claude, get back commentary.
     Returns dict with content, model, token usage.
     """
-    if not ANTHROPIC_API_KEY or ANTHROPIC_API_KEY == 'your_key_here':
+    if _CLIENT is None:
         logger.error("ANTHROPIC_API_KEY not configured")
         return None
 
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
-
-    user_prompt = USER_PROMPT_TEMPLATE.format(consolidated_text=consolidated_text)
-
     logger.info(f"Sending to Claude ({MODEL})...")
     logger.info(f"  Input size: ~{len(consolidated_text) // 4} tokens")
 
     try:
-        response = client.messages.create(
-            model=MODEL,
-            max_tokens=2048,
-            system=SYSTEM_PROMPT,
-            messages=[
-                {"role": "user", "content": user_prompt}
-            ]
-        )
-
-        content = response.content[0].text
-        usage = {
-            'input_tokens': response.usage.input_tokens,
-            'output_tokens': response.usage.output_tokens,
-            'model': MODEL,
-            'prompt_version': PROMPT_VERSION,
-        }
-
-        # Rough cost calc (Sonnet pricing: $3/M input, $15/M output)
-        cost = (usage['input_tokens'] * 3 + usage['output_tokens'] * 15) / 1_000_000
-        usage['estimated_cost'] = round(cost, 4)
-
-        logger.info(f"  Response: {usage['output_tokens']} tokens, ~${cost:.4f}")
-
-        return {
-            'content': content,
-            'usage': usage,
-        }
+        result = writer_result(create_message(_CLIENT, **writer_params(consolidated_text)))
+        logger.info(f"  Response: {result['usage']['output_tokens']} tokens, ~${result['usage']['estimated_cost']:.4f}")
+        return result
     except Exception as e:
         logger.error(f"Claude API call failed: {e}")
         return None
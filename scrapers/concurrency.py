@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Concurrency - Bounded fan-out of blocking per-event work.
+
+The scheduler and the intro orchestrator both run each event's scrape → write
+→ edit on worker threads, a few events at a time, so one event's network and
+LLM latency overlaps with the others'.
+
+Usage:
+    from concurrency import gather_bounded
+
+    outcomes = asyncio.run(gather_bounded(process_event, events))
+"""
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import os
+import asyncio
+
+# Events processed at once; matches Anthropic's per-key concurrent-connection cap
+EVENT_CONCURRENCY = int(os.getenv('COMMENTARY_CONCURRENCY', '5'))
+
+
+async def gather_bounded(func, items, concurrency=EVENT_CONCURRENCY):
+    """
+    Run blocking func(item) for every item on worker threads, at most `concurrency`
+    at a time. Returns results in item order; exceptions are returned, not raised.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def bounded(item):
+        async with sem:
+            return await asyncio.to_thread(func, item)
+
+    return await asyncio.gather(*(bounded(item) for item in items), return_exceptions=True)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+DB Pool - One psycopg2 connection pool shared by the commentary pipeline.
+
+The scheduler, both orchestrators and the editor cache all borrow from the
+same ThreadedConnectionPool, so a run opens a handful of backends instead of
+one connect/auth handshake per status update or save.
+
+Usage:
+    from db_pool import pooled_connection
+
+    with pooled_connection() as conn, conn.cursor() as cur:
+        cur.execute(...)
+"""
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import os
+import atexit
+import threading
+from contextlib import contextmanager
+from psycopg2.pool import ThreadedConnectionPool
+
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST', '127.0.0.1'),
+    'port': int(os.getenv('DB_PORT', '5432')),
+    'database': os.getenv('DB_NAME', 'olympics_tv'),
+    'user': os.getenv('DB_USER'),
+    'password': os.getenv('DB_PASSWORD')
+}
+
+# Must cover COMMENTARY_CONCURRENCY worker threads plus the scheduler itself
+POOL_MAXCONN = int(os.getenv('SCRAPER_DB_POOL_MAX', '8'))
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+# ThreadedConnectionPool raises when exhausted; this makes borrowers wait instead
+_slots = threading.BoundedSemaphore(POOL_MAXCONN)
+
+
+def _pool():
+    """Lazily create the shared pool (thread-safe)"""
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ThreadedConnectionPool(1, POOL_MAXCONN, **DB_CONFIG)
+    return _POOL
+
+
+@atexit.register
+def _close_pool():
+    """Close every pooled connection when the process exits"""
+    if _POOL is not None:
+        _POOL.closeall()
+
+
+@contextmanager
+def pooled_connection():
+    """Borrow a pooled connection; commit on success, roll back on error"""
+    with _slots:
+        conn = _pool().getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            _pool().putconn(conn)
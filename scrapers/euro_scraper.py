@@ -14,7 +14,11 @@ load_dotenv()
 
 import os
 import json
+import asyncio
+import functools
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import psycopg2
 from psycopg2.extras import execute_values
 from datetime import datetime, timedelta, timezone
@@ -23,6 +27,15 @@ import time
 import logging
 import re
 
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        # Rust encoder, several times faster than json.dumps on nested EPG payloads
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    _json_dumps = json.dumps
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -38,6 +51,18 @@ DB_CONFIG = {
     'password': os.getenv('DB_PASSWORD')
 }
 
+# Concurrent requests per EPG host, and the per-host request rate (req/s) a
+# token bucket holds them to, so epg.pw still sees a polite request rate
+FETCH_CONCURRENCY = int(os.getenv('EURO_FETCH_CONCURRENCY', '4'))
+FETCH_RATE_PER_HOST = float(os.getenv('EURO_FETCH_RATE', '2'))
+
+# euro_broadcasts columns written by upsert_broadcasts, in statement order
+BROADCAST_COLUMNS = (
+    'broadcast_id', 'channel_code', 'title_original', 'title_english',
+    'description', 'start_time', 'end_time', 'duration_minutes',
+    'is_live', 'is_replay', 'source_event_id',
+)
+
 # Olympic keyword patterns per language for content filtering
 OLYMPIC_KEYWORDS = [
     # English
@@ -85,20 +110,88 @@ SPORT_KEYWORDS_MULTI = {
 }
 
 
+def _keyword_re(keywords):
+    """One alternation over all keywords, longest first; a single C-level scan
+    per text instead of one Python `in` test per keyword"""
+    return re.compile('|'.join(re.escape(kw) for kw in sorted(set(keywords), key=len, reverse=True)))
+
+
+_OLYMPIC_RE = _keyword_re(OLYMPIC_KEYWORDS)
+_SPORT_RE = _keyword_re(kw for keywords in SPORT_KEYWORDS_MULTI.values() for kw in keywords)
+
+
+@functools.lru_cache(maxsize=8192)
+def _is_olympic(title, description):
+    """is_olympic_content's matcher. Module-level so the cache doesn't hold the
+    scraper; EPG feeds repeat the same titles across channels and days, so
+    most calls are cache hits."""
+    # Most Olympic programs say so in the (short) title; only lowercase and
+    # scan the description when the title alone doesn't match
+    title_l = title.lower() if title else ''
+    if _OLYMPIC_RE.search(title_l):
+        return True
+    if description:
+        text = f"{title_l} {description.lower()}"
+        if _OLYMPIC_RE.search(text):
+            return True
+    else:
+        text = title_l
+    # Also match '2026' combined with any sport keyword
+    return '2026' in text and _SPORT_RE.search(text) is not None
+
+
+class _TokenBucket:
+    """Async token bucket: up to `rate` requests per second, bursting to `rate`.
+    Only waits when the next request would actually exceed the rate."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
 class EuroScraper:
     def __init__(self):
         self.conn = None
         self.channels = {}  # channel_code -> channel row
         self.stats = {'raw_saved': 0, 'olympic_found': 0, 'broadcasts_upserted': 0}
+        self._raw_buffer = []  # save_raw rows waiting for flush_raw
+        self.session = self._make_session()
         self.connect()
         self.load_channels()
 
+    @staticmethod
+    def _make_session():
+        """Keep-alive session shared by all fetch threads: one TLS handshake per
+        host instead of per request, plus retries on transient HTTP errors."""
+        session = requests.Session()
+        session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=max(16, FETCH_CONCURRENCY),
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+        )
+        session.mount('https://', adapter)
+        return session
+
     def connect(self):
         try:
             self.conn = psycopg2.connect(**DB_CONFIG)
             logger.info("Connected to PostgreSQL")
         except Exception as e:
-            logger.error(f"Failed to connect: {e}")
+            logger.error("Failed to connect: %s", e)
             raise
 
     def load_channels(self):
@@ -106,7 +199,7 @@ class EuroScraper:
         cur = self.conn.cursor()
         cur.execute("""
             SELECT channel_code, display_name, country_code, source,
-                   source_channel_id, timezone, language
+                   source_channel_id, timezone, language, always_olympic
             FROM euro_channels WHERE is_active = TRUE
         """)
         for row in cur.fetchall():
@@ -114,29 +207,33 @@ class EuroScraper:
                 'channel_code': row[0], 'display_name': row[1],
                 'country_code': row[2], 'source': row[3],
                 'source_channel_id': row[4], 'timezone': row[5],
-                'language': row[6]
+                'language': row[6], 'always_olympic': row[7]
             }
         cur.close()
-        logger.info(f"Loaded {len(self.channels)} active channels")
+
+        # Per-source lookups used by every scrape_date call
+        self.epg_pw_channels = {k: v for k, v in self.channels.items() if v['source'] == 'epg_pw'}
+        self.allente_countries = {}  # country_code -> {source_channel_id: channel_code}
+        for code, ch in self.channels.items():
+            if ch['source'] == 'allente':
+                channel_map = self.allente_countries.setdefault(ch['country_code'], {})
+                # Map source_channel_id -> channel_code for lookup
+                channel_map[ch['source_channel_id']] = code
+                # Also map without leading zeros
+                channel_map[ch['source_channel_id'].lstrip('0')] = code
+
+        logger.info("Loaded %d active channels", len(self.channels))
 
     def is_olympic_content(self, title, description=''):
         """Check if a program is Olympic content based on title/description keywords."""
-        text = f"{title} {description}".lower()
-        for kw in OLYMPIC_KEYWORDS:
-            if kw in text:
-                return True
-        # Also match '2026' combined with any sport keyword
-        if '2026' in text:
-            for sport, keywords in SPORT_KEYWORDS_MULTI.items():
-                for kw in keywords:
-                    if kw in text:
-                        return True
-        return False
+        return _is_olympic(title, description)
 
     def generate_broadcast_id(self, channel_code, start_time_str, title):
         """Generate a stable unique ID for a broadcast."""
         raw = f"{channel_code}|{start_time_str}|{title}"
-        return hashlib.md5(raw.encode()).hexdigest()[:16]
+        # Must stay MD5: existing euro_broadcasts / euro_broadcast_units rows are keyed
+        # on it and can't be re-derived (start_time string and full title aren't stored)
+        return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()[:16]
 
     # ── epg.pw API ──────────────────────────────────────────────
 
@@ -148,24 +245,24 @@ class EuroScraper:
         ch = self.channels[channel_code]
         url = f"https://epg.pw/api/epg.json?channel_id={ch['source_channel_id']}&date={date_str}&timezone={ch['timezone']}"
         try:
-            resp = requests.get(url, timeout=15, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
-            })
+            resp = self.session.get(url, timeout=15)
             resp.raise_for_status()
             data = resp.json()
             return data
         except Exception as e:
-            logger.warning(f"epg.pw fetch failed for {channel_code}: {e}")
+            logger.warning("epg.pw fetch failed for %s: %s", channel_code, e)
             return None
 
     def parse_epg_pw_programs(self, channel_code, raw_data):
         """Parse epg.pw response into normalized broadcast records."""
         programs = raw_data.get('epg_list', [])
+        # Dedicated Olympic channels (migration 010) skip the keyword filter
+        always_olympic = self.channels[channel_code].get('always_olympic')
         results = []
         for p in programs:
             title = p.get('title', '')
             desc = p.get('desc', '')
-            if not self.is_olympic_content(title, desc):
+            if not always_olympic and not self.is_olympic_content(title, desc):
                 continue
             start = p.get('start_date', p.get('start', ''))
             end = p.get('end_date', p.get('end', ''))
@@ -173,9 +270,9 @@ class EuroScraper:
             results.append({
                 'broadcast_id': broadcast_id,
                 'channel_code': channel_code,
-                'title_original': title[:500] if title else None,
+                'title_original': title or None,
                 'title_english': None,  # epg.pw doesn't provide translations
-                'description': desc[:2000] if desc else None,
+                'description': desc or None,
                 'start_time': start,
                 'end_time': end if end else None,
                 'duration_minutes': None,
@@ -199,20 +296,24 @@ class EuroScraper:
             return None
         url = f"https://cs-vcb.allente.{domain}/epg/events?date={date_str_iso}"
         try:
-            resp = requests.get(url, timeout=20, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
-            })
+            resp = self.session.get(url, timeout=20)
             resp.raise_for_status()
             return resp.json()
         except Exception as e:
-            logger.warning(f"Allente fetch failed for {country_code}: {e}")
+            logger.warning("Allente fetch failed for %s: %s", country_code, e)
             return None
 
     def parse_allente_programs(self, allente_data, target_channels):
         """Parse Allente response for specific channels, filter Olympic content.
         target_channels: dict of source_channel_id -> channel_code
         """
-        results = []
+        return [b for _, _, broadcasts in self.iter_allente_channels(allente_data, target_channels)
+                for b in broadcasts]
+
+    def iter_allente_channels(self, allente_data, target_channels):
+        """Single pass over an Allente response: yields (channel_code, raw channel
+        dict, Olympic broadcast records) for each channel in target_channels.
+        """
         for ch in allente_data.get('channels', []):
             allente_id = str(ch.get('id', ''))
             # Allente IDs can be with or without leading zeros
@@ -223,10 +324,13 @@ class EuroScraper:
                 if not channel_code:
                     continue
 
+            # Dedicated Olympic channels (migration 010) skip the keyword filter
+            always_olympic = self.channels[channel_code].get('always_olympic')
+            results = []
             for evt in ch.get('events', []):
                 title = evt.get('title', '')
                 desc = evt.get('details', {}).get('description', '') if isinstance(evt.get('details'), dict) else ''
-                if not self.is_olympic_content(title, desc):
+                if not always_olympic and not self.is_olympic_content(title, desc):
                     continue
                 start = evt.get('time', '')
                 duration = evt.get('details', {}).get('duration', 0) if isinstance(evt.get('details'), dict) else 0
@@ -237,9 +341,9 @@ class EuroScraper:
                 results.append({
                     'broadcast_id': broadcast_id,
                     'channel_code': channel_code,
-                    'title_original': title[:500] if title else None,
+                    'title_original': title or None,
                     'title_english': None,
-                    'description': desc[:2000] if desc else None,
+                    'description': desc or None,
                     'start_time': start,
                     'end_time': None,
                     'duration_minutes': duration if duration else None,
@@ -247,122 +351,164 @@ class EuroScraper:
                     'is_replay': False,
                     'source_event_id': source_id if source_id else None,
                 })
-        return results
+            yield channel_code, ch, results
 
     # ── Database operations ─────────────────────────────────────
 
     def save_raw(self, channel_code, date_queried, source, raw_json):
-        """Archive raw API response."""
+        """Queue a raw API response for archival (written by flush_raw)."""
+        self._raw_buffer.append((channel_code, date_queried, source, _json_dumps(raw_json)))
+
+    def flush_raw(self):
+        """Archive all queued raw responses in one statement and one commit."""
+        if not self._raw_buffer:
+            return
+        # One row per conflict key, last response wins (as with one upsert per call)
+        rows = list({row[:3]: row for row in self._raw_buffer}.values())
+        self._raw_buffer.clear()
         cur = self.conn.cursor()
         try:
-            cur.execute("""
+            execute_values(cur, """
                 INSERT INTO euro_broadcasts_raw (channel_code, date_queried, source, raw_json)
-                VALUES (%s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT (channel_code, date_queried, source)
                 DO UPDATE SET raw_json = EXCLUDED.raw_json, fetched_at = NOW()
-            """, (channel_code, date_queried, source, json.dumps(raw_json)))
+            """, rows, page_size=200)
             self.conn.commit()
-            self.stats['raw_saved'] += 1
+            self.stats['raw_saved'] += len(rows)
         except Exception as e:
             self.conn.rollback()
-            logger.warning(f"Failed to save raw for {channel_code}/{date_queried}: {e}")
+            logger.warning("Failed to save %d raw responses: %s", len(rows), e)
         finally:
             cur.close()
 
     def upsert_broadcasts(self, broadcasts):
-        """Upsert normalized Olympic broadcasts."""
+        """Upsert normalized Olympic broadcasts in one statement.
+        Each column is sent as one array and expanded by unnest(), so the
+        statement text and its plan are the same size whatever the batch size.
+        Title/description are truncated to their column limits server-side."""
         if not broadcasts:
             return
+        # A statement can't upsert the same key twice; keep the last record per id
+        # (the per-row loop this replaced had the same last-write-wins result)
+        rows = list({b['broadcast_id']: b for b in broadcasts}.values())
+        columns = [[b[col] for b in rows] for col in BROADCAST_COLUMNS]
         cur = self.conn.cursor()
         try:
-            for b in broadcasts:
-                cur.execute("""
-                    INSERT INTO euro_broadcasts (
-                        broadcast_id, channel_code, title_original, title_english,
-                        description, start_time, end_time, duration_minutes,
-                        is_live, is_replay, source_event_id
-                    ) VALUES (
-                        %(broadcast_id)s, %(channel_code)s, %(title_original)s, %(title_english)s,
-                        %(description)s, %(start_time)s, %(end_time)s, %(duration_minutes)s,
-                        %(is_live)s, %(is_replay)s, %(source_event_id)s
-                    )
-                    ON CONFLICT (broadcast_id) DO UPDATE SET
-                        title_original = EXCLUDED.title_original,
-                        description = EXCLUDED.description,
-                        start_time = EXCLUDED.start_time,
-                        end_time = EXCLUDED.end_time,
-                        duration_minutes = EXCLUDED.duration_minutes,
-                        is_live = EXCLUDED.is_live,
-                        source_event_id = EXCLUDED.source_event_id,
-                        updated_at = NOW()
-                """, b)
+            cur.execute("""
+                INSERT INTO euro_broadcasts (
+                    broadcast_id, channel_code, title_original, title_english,
+                    description, start_time, end_time, duration_minutes,
+                    is_live, is_replay, source_event_id
+                )
+                SELECT broadcast_id, channel_code,
+                       LEFT(title_original, 500), title_english, LEFT(description, 2000),
+                       start_time, end_time, duration_minutes,
+                       is_live, is_replay, source_event_id
+                FROM unnest(
+                    %s::varchar[], %s::varchar[], %s::varchar[], %s::varchar[],
+                    %s::text[], %s::timestamptz[], %s::timestamptz[], %s::integer[],
+                    %s::boolean[], %s::boolean[], %s::varchar[]
+                ) AS t(
+                    broadcast_id, channel_code, title_original, title_english,
+                    description, start_time, end_time, duration_minutes,
+                    is_live, is_replay, source_event_id
+                )
+                ON CONFLICT (broadcast_id) DO UPDATE SET
+                    title_original = EXCLUDED.title_original,
+                    description = EXCLUDED.description,
+                    start_time = EXCLUDED.start_time,
+                    end_time = EXCLUDED.end_time,
+                    duration_minutes = EXCLUDED.duration_minutes,
+                    is_live = EXCLUDED.is_live,
+                    source_event_id = EXCLUDED.source_event_id,
+                    updated_at = NOW()
+            """, columns)
             self.conn.commit()
-            self.stats['broadcasts_upserted'] += len(broadcasts)
+            self.stats['broadcasts_upserted'] += len(rows)
         except Exception as e:
             self.conn.rollback()
-            logger.error(f"Failed to upsert broadcasts: {e}")
+            logger.error("Failed to upsert broadcasts: %s", e)
             raise
         finally:
             cur.close()
 
     # ── Main orchestration ──────────────────────────────────────
 
+    async def _fetch_all(self, date_epg, date_iso, epg_pw_codes, allente_ccs):
+        """Run every channel/country fetch for one date on worker threads,
+        at most FETCH_CONCURRENCY per host at a time. Returns (epg_pw results,
+        Allente results) in input order; a failed fetch is None."""
+        hosts = {}
+
+        async def bounded(host, fetch, *args):
+            if host not in hosts:
+                hosts[host] = (asyncio.Semaphore(FETCH_CONCURRENCY), _TokenBucket(FETCH_RATE_PER_HOST))
+            sem, bucket = hosts[host]
+            async with sem:
+                await bucket.acquire()  # Be polite to the host
+                return await asyncio.to_thread(fetch, *args)
+
+        results = await asyncio.gather(
+            *(bounded('epg.pw', self.fetch_epg_pw, code, date_epg) for code in epg_pw_codes),
+            *(bounded(f'allente.{cc}', self.fetch_allente, cc, date_iso) for cc in allente_ccs),
+        )
+        return results[:len(epg_pw_codes)], results[len(epg_pw_codes):]
+
     def scrape_date(self, target_date):
-        """Scrape all channels for a single date."""
+        """Scrape all channels for a single date. Fetches run concurrently;
+        parsing and DB writes stay on the calling thread."""
         date_epg = target_date.strftime('%Y%m%d')    # epg.pw format
         date_iso = target_date.strftime('%Y-%m-%d')   # Allente format
         date_db = target_date.date() if hasattr(target_date, 'date') else target_date
 
-        logger.info(f"═══ Scraping {date_iso} ═══")
+        logger.info("═══ Scraping %s ═══", date_iso)
+
+        epg_pw_channels = self.epg_pw_channels
+        allente_countries = self.allente_countries  # one Allente call per country
+
+        epg_pw_raw, allente_raw = asyncio.run(
+            self._fetch_all(date_epg, date_iso, list(epg_pw_channels), list(allente_countries))
+        )
+
+        # Every channel's programs for the date go to the DB in one upsert
+        date_broadcasts = []
 
         # ── epg.pw channels ──
-        epg_pw_channels = {k: v for k, v in self.channels.items() if v['source'] == 'epg_pw'}
-        for code, ch in epg_pw_channels.items():
-            raw = self.fetch_epg_pw(code, date_epg)
+        for (code, ch), raw in zip(epg_pw_channels.items(), epg_pw_raw):
             if raw is None:
                 continue
             self.save_raw(code, date_db, 'epg_pw', raw)
             broadcasts = self.parse_epg_pw_programs(code, raw)
             if broadcasts:
-                self.upsert_broadcasts(broadcasts)
+                date_broadcasts.extend(broadcasts)
                 self.stats['olympic_found'] += len(broadcasts)
-                logger.info(f"  {ch['display_name']:20s} → {len(broadcasts)} Olympic programs")
-            time.sleep(0.5)  # Be polite to epg.pw
-
-        # ── Allente channels (one call per country) ──
-        allente_countries = {}
-        for code, ch in self.channels.items():
-            if ch['source'] == 'allente':
-                cc = ch['country_code']
-                if cc not in allente_countries:
-                    allente_countries[cc] = {}
-                # Map source_channel_id -> channel_code for lookup
-                allente_countries[cc][ch['source_channel_id']] = code
-                # Also map without leading zeros
-                allente_countries[cc][ch['source_channel_id'].lstrip('0')] = code
+                logger.info("  %-20s → %d Olympic programs", ch['display_name'], len(broadcasts))
 
-        for country_code, channel_map in allente_countries.items():
-            raw = self.fetch_allente(country_code, date_iso)
+        # ── Allente channels ──
+        for (country_code, channel_map), raw in zip(allente_countries.items(), allente_raw):
             if raw is None:
                 continue
-            # Save raw per channel (extract each channel's data from the bulk response)
-            for ch_data in raw.get('channels', []):
-                allente_id = str(ch_data.get('id', ''))
-                ch_code = channel_map.get(allente_id) or channel_map.get(allente_id.lstrip('0'))
-                if ch_code:
-                    self.save_raw(ch_code, date_db, 'allente', ch_data)
-            broadcasts = self.parse_allente_programs(raw, channel_map)
+            # One pass: save raw per channel (extracted from the bulk response)
+            # and collect its Olympic programs
+            broadcasts = []
+            by_ch = {}
+            for ch_code, ch_data, ch_broadcasts in self.iter_allente_channels(raw, channel_map):
+                self.save_raw(ch_code, date_db, 'allente', ch_data)
+                if ch_broadcasts:
+                    broadcasts.extend(ch_broadcasts)
+                    by_ch[ch_code] = by_ch.get(ch_code, 0) + len(ch_broadcasts)
             if broadcasts:
-                self.upsert_broadcasts(broadcasts)
+                date_broadcasts.extend(broadcasts)
                 self.stats['olympic_found'] += len(broadcasts)
                 # Log per-channel breakdown
-                by_ch = {}
-                for b in broadcasts:
-                    by_ch[b['channel_code']] = by_ch.get(b['channel_code'], 0) + 1
                 for ch_code, count in by_ch.items():
                     ch_name = self.channels[ch_code]['display_name']
-                    logger.info(f"  {ch_name:20s} → {count} Olympic programs")
-            time.sleep(0.5)
+                    logger.info("  %-20s → %d Olympic programs", ch_name, count)
+
+        # Archive raw responses first: if the upsert fails they can be replayed
+        self.flush_raw()
+        self.upsert_broadcasts(date_broadcasts)
 
     def run(self, days_ahead=3, days_back=0):
         """Scrape Euro broadcasts for a date range.
@@ -375,8 +521,8 @@ class EuroScraper:
         start_date = today - timedelta(days=days_back)
         end_date = min(today + timedelta(days=days_ahead), olympics_end)
 
-        logger.info(f"Euro TV scraper starting: {start_date} to {end_date}")
-        logger.info(f"Active channels: {len(self.channels)}")
+        logger.info("Euro TV scraper starting: %s to %s", start_date, end_date)
+        logger.info("Active channels: %d", len(self.channels))
 
         current = start_date
         while current <= end_date:
@@ -384,11 +530,12 @@ class EuroScraper:
             current += timedelta(days=1)
 
         logger.info("═══ Scrape Complete ═══")
-        logger.info(f"  Raw responses saved: {self.stats['raw_saved']}")
-        logger.info(f"  Olympic programs found: {self.stats['olympic_found']}")
-        logger.info(f"  Broadcasts upserted: {self.stats['broadcasts_upserted']}")
+        logger.info("  Raw responses saved: %d", self.stats['raw_saved'])
+        logger.info("  Olympic programs found: %d", self.stats['olympic_found'])
+        logger.info("  Broadcasts upserted: %d", self.stats['broadcasts_upserted'])
 
     def close(self):
+        self.session.close()
         if self.conn:
             self.conn.close()
             logger.info("Database connection closed")
@@ -400,7 +547,7 @@ def main():
         # Scrape today + next 2 days (EPG data is usually 2-3 days ahead)
         scraper.run(days_ahead=2, days_back=0)
     except Exception as e:
-        logger.error(f"Scraper failed: {e}")
+        logger.error("Scraper failed: %s", e)
         raise
     finally:
         scraper.close()
@@ -13,12 +13,20 @@ import json
 import logging
 import anthropic
 
+from rate_limiter import create_message
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
 MODEL = "claude-sonnet-4-20250514"
 
+# One client per process so every call reuses its pooled HTTPS connections
+_CLIENT = (
+    anthropic.Anthropic(api_key=ANTHROPIC_API_KEY, max_retries=0)
+    if ANTHROPIC_API_KEY and ANTHROPIC_API_KEY != 'your_key_here' else None
+)
+
 
 # ============================================================
 # AGENT 1: SOURCE-CHECKER
@@ -92,13 +100,13 @@ Just output the polished preview. No commentary about your edits."""
 # ============================================================
 
 def _call_claude(system_prompt, user_prompt, label="Agent"):
-    if not ANTHROPIC_API_KEY or ANTHROPIC_API_KEY == 'your_key_here':
+    if _CLIENT is None:
         logger.error("ANTHROPIC_API_KEY not configured")
         return None
 
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
     try:
-        response = client.messages.create(
+        response = create_message(
+            _CLIENT,
             model=MODEL,
             max_tokens=1536,
             system=system_prompt,
@@ -23,13 +23,19 @@ Usage:
 from dotenv import load_dotenv
 load_dotenv()
 
+import io
 import os
 import sys
-import json
-import psycopg2
+import hashlib
 import logging
 import argparse
+import asyncio
 from datetime import datetime, timedelta
+from psycopg2.extras import Json
+
+from db_pool import pooled_connection
+from concurrency import gather_bounded
+from rate_limiter import estimate_tokens
 
 logging.basicConfig(
     level=logging.INFO,
@@ -37,54 +43,54 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-DB_CONFIG = {
-    'host': os.getenv('DB_HOST', '127.0.0.1'),
-    'port': int(os.getenv('DB_PORT', '5432')),
-    'database': os.getenv('DB_NAME', 'olympics_tv'),
-    'user': os.getenv('DB_USER'),
-    'password': os.getenv('DB_PASSWORD')
-}
-
+# Runs with at least this many events write through the Message Batches API
+MESSAGE_BATCH_MIN_EVENTS = int(os.getenv('MESSAGE_BATCH_MIN_EVENTS', '4'))
+# Source-text budget per preview prompt (estimated tokens); a 300-500 word
+# preview doesn't need more, and input tokens are most of the writer's cost
+PREVIEW_TOKEN_BUDGET = int(os.getenv('PREVIEW_TOKEN_BUDGET', '12000'))
+# Per-article cap applied once the budget is exceeded
+ARTICLE_TOKEN_CAP = 2000
 
-def get_upcoming_events(target_date, mode='all'):
-    """Find events scheduled for target_date that don't have pre_event commentary."""
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor()
 
+def get_upcoming_events(target_date, mode='all', limit=None):
+    """Find events scheduled for target_date that don't have pre_event commentary (first `limit` by start time)."""
     query = """
-        SELECT DISTINCT su.event_unit_code, d.name as discipline,
+        SELECT su.event_unit_code, d.name as discipline,
                e.name as event, su.event_unit_name, su.medal_flag,
                su.start_time, su.status
         FROM schedule_units su
         JOIN events e ON su.event_id = e.event_id
         JOIN disciplines d ON e.discipline_code = d.code
-        LEFT JOIN commentary c
-            ON c.event_unit_code = su.event_unit_code
+        -- Range predicate keeps idx_schedule_units_start_time usable (migration 006)
+        WHERE su.start_time >= %(day)s::date
+        AND su.start_time < %(day)s::date + 1
+        -- Anti-join served by idx_commentary_pre_event_written (migration 009)
+        AND NOT EXISTS (
+            SELECT 1 FROM commentary c
+            WHERE c.event_unit_code = su.event_unit_code
             AND c.commentary_type = 'pre_event'
             AND c.content IS NOT NULL
-        WHERE su.start_time::date = %s
-        AND c.id IS NULL
+        )
     """
 
     if mode == 'medals':
         query += " AND su.medal_flag > 0"
 
     query += " ORDER BY su.start_time"
+    if limit:
+        query += " LIMIT %(limit)s"
 
-    cur.execute(query, (target_date,))
-    events = [{
-        'event_unit_code': row[0],
-        'discipline': row[1],
-        'event': row[2],
-        'unit_name': row[3],
-        'medal_flag': row[4],
-        'start_time': row[5],
-        'status': row[6],
-    } for row in cur.fetchall()]
-
-    cur.close()
-    conn.close()
-    return events
+    with pooled_connection() as conn, conn.cursor() as cur:
+        cur.execute(query, {'day': target_date, 'limit': limit})
+        return [{
+            'event_unit_code': row[0],
+            'discipline': row[1],
+            'event': row[2],
+            'unit_name': row[3],
+            'medal_flag': row[4],
+            'start_time': row[5],
+            'status': row[6],
+        } for row in cur.fetchall()]
 
 
 def build_preview_queries(event):
@@ -132,116 +138,171 @@ def build_preview_queries(event):
     }
 
 
+def fit_token_budget(articles, budget=PREVIEW_TOKEN_BUDGET):
+    """
+    Articles cut down to fit budget. Over budget, each body is capped at
+    ARTICLE_TOKEN_CAP (ending on a paragraph break, marked [TRUNCATED]); if that
+    is still too much, articles are dropped from the end (scrape order puts the
+    preview query's results first). Title, URL and snippet are never touched.
+    """
+    if estimate_tokens(*(a['text'] for a in articles)) <= budget:
+        return articles
+
+    cap = ARTICLE_TOKEN_CAP * 4
+    trimmed = []
+    for a in articles:
+        if len(a['text']) > cap:
+            text = a['text'][:cap]
+            cut = text.rfind('\n\n')
+            if cut > cap // 2:
+                text = text[:cut]
+            a = dict(a, text=f"{text}\n[TRUNCATED]")
+        trimmed.append(a)
+
+    while len(trimmed) > 1 and estimate_tokens(*(a['text'] for a in trimmed)) > budget:
+        dropped = trimmed.pop()
+        logger.info(f"  Over token budget, dropping source: {dropped['domain']}")
+    return trimmed
+
+
 def build_preview_consolidated(resolved, articles):
     """Build consolidated source file for preview (no results section)."""
-    lines = []
+    buf = io.StringIO()
+    w = buf.write
 
-    lines.append("=== EVENT CONTEXT ===")
-    lines.append(f"Event: {resolved['event_label']}")
-    lines.append(f"Discipline: {resolved['discipline']}")
-    lines.append(f"Scheduled: {resolved['start_time'].strftime('%B %d, %Y at %I:%M %p')} CET")
-    lines.append(f"Medal Event: {'Yes' if resolved['is_medal_event'] else 'No'}")
-    lines.append(f"Unit: {resolved['unit_name']}")
-    lines.append("")
+    w(f"=== EVENT CONTEXT ===\n"
+      f"Event: {resolved['event_label']}\n"
+      f"Discipline: {resolved['discipline']}\n"
+      f"Scheduled: {resolved['start_time'].strftime('%B %d, %Y at %I:%M %p')} CET\n"
+      f"Medal Event: {'Yes' if resolved['is_medal_event'] else 'No'}\n"
+      f"Unit: {resolved['unit_name']}\n\n")
 
     for i, article in enumerate(articles, 1):
-        lines.append(f"=== SOURCE {i}: {article['domain']} ===")
-        lines.append(f"URL: {article['url']}")
-        lines.append(f"Title: {article['title']}")
+        w(f"=== SOURCE {i}: {article['domain']} ===\n"
+          f"URL: {article['url']}\n"
+          f"Title: {article['title']}\n")
         if article.get('authors'):
-            lines.append(f"Authors: {', '.join(article['authors'])}")
+            w(f"Authors: {', '.join(article['authors'])}\n")
         if article.get('publish_date'):
-            lines.append(f"Published: {article['publish_date']}")
-        lines.append(f"Found via: {article['query_type']} search - {article['query_reason']}")
-        lines.append(f"Snippet: {article['snippet']}")
-        lines.append("---")
-        lines.append(article['text'])
-        lines.append("")
+            w(f"Published: {article['publish_date']}\n")
+        w(f"Found via: {article['query_type']} search - {article['query_reason']}\n"
+          f"Snippet: {article['snippet']}\n"
+          f"---\n")
+        # Article bodies are the bulk of the file: written as-is, never reformatted
+        w(article['text'])
+        w("\n\n")
 
     if not articles:
-        lines.append("=== NO SOURCES FOUND ===")
-        lines.append("No preview articles could be found for this event.")
-        lines.append("")
+        w("=== NO SOURCES FOUND ===\n"
+          "No preview articles could be found for this event.\n\n")
 
-    return '\n'.join(lines)
+    # Every line above is newline-terminated; the old '\n'.join output had no final newline
+    return buf.getvalue()[:-1]
 
 
 def update_status(event_unit_code, status, error_message=None):
-    """Update or insert pre_event commentary status."""
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor()
-
-    cur.execute(
-        "SELECT id FROM commentary WHERE event_unit_code = %s AND commentary_type = 'pre_event'",
-        (event_unit_code,)
-    )
-    existing = cur.fetchone()
-
-    if existing:
-        if error_message:
-            cur.execute("""
-                UPDATE commentary SET status = %s, error_message = %s, updated_at = NOW()
-                WHERE event_unit_code = %s AND commentary_type = 'pre_event'
-            """, (status, error_message, event_unit_code))
-        else:
-            cur.execute("""
-                UPDATE commentary SET status = %s, updated_at = NOW()
-                WHERE event_unit_code = %s AND commentary_type = 'pre_event'
-            """, (status, event_unit_code))
-    else:
+    """Update or insert pre_event commentary status (one UPSERT; see migration 011)."""
+    with pooled_connection() as conn, conn.cursor() as cur:
         cur.execute("""
             INSERT INTO commentary (event_unit_code, commentary_type, commentary_date,
-                                    status, created_at, updated_at)
-            VALUES (%s, 'pre_event', NOW(), %s, NOW(), NOW())
-        """, (event_unit_code, status))
+                                    status, error_message, created_at, updated_at)
+            VALUES (%s, 'pre_event', NOW(), %s, %s, NOW(), NOW())
+            ON CONFLICT (event_unit_code, commentary_type) DO UPDATE SET
+                status = EXCLUDED.status,
+                error_message = COALESCE(EXCLUDED.error_message, commentary.error_message),
+                updated_at = NOW()
+        """, (event_unit_code, status, error_message))
 
-    conn.commit()
-    cur.close()
-    conn.close()
+
+def consolidated_hash(consolidated):
+    """Fingerprint of the exact source text an intro was written from."""
+    return hashlib.sha256(consolidated.encode()).hexdigest()
+
+
+def unchanged_intro_status(event_unit_code, consolidated):
+    """
+    Status of a saved intro written from identical sources with the current
+    prompt, or None. Only manual re-runs (the single-event CLI) can hit this:
+    run_batch and the scheduler only select events without pre_event content.
+    """
+    from intro_writer import PROMPT_VERSION
+
+    with pooled_connection() as conn, conn.cursor() as cur:
+        cur.execute("""
+            SELECT status FROM commentary
+            WHERE event_unit_code = %s AND commentary_type = 'pre_event'
+            AND content IS NOT NULL
+            AND prompt_version = %s
+            AND raw_scrape_data->>'consolidated_hash' = %s
+        """, (event_unit_code, PROMPT_VERSION, consolidated_hash(consolidated)))
+        row = cur.fetchone()
+        return row[0] if row else None
 
 
 def save_intro(event_unit_code, content, proofed_content, sources_meta,
                raw_scrape_data, writer_usage, editor_result):
     """Save completed intro to DB."""
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor()
-
     corrections = editor_result.get('corrections', '') if editor_result else ''
     llm_model = writer_usage.get('model', '') if writer_usage else ''
     prompt_ver = writer_usage.get('prompt_version', '') if writer_usage else ''
 
-    cur.execute("""
-        UPDATE commentary SET
-            content = %s,
-            proofed_content = %s,
-            sources = %s,
-            raw_scrape_data = %s,
-            status = 'proofed',
-            llm_model = %s,
-            prompt_version = %s,
-            updated_at = NOW()
-        WHERE event_unit_code = %s AND commentary_type = 'pre_event'
-    """, (
-        content,
-        proofed_content,
-        json.dumps(sources_meta),
-        json.dumps({'consolidated_text': raw_scrape_data, 'corrections': corrections}),
-        llm_model,
-        prompt_ver,
-        event_unit_code,
-    ))
-
-    conn.commit()
-    cur.close()
-    conn.close()
+    with pooled_connection() as conn, conn.cursor() as cur:
+        cur.execute("""
+            UPDATE commentary SET
+                content = %s,
+                proofed_content = %s,
+                sources = %s,
+                raw_scrape_data = %s,
+                status = 'proofed',
+                llm_model = %s,
+                prompt_version = %s,
+                updated_at = NOW()
+            WHERE event_unit_code = %s AND commentary_type = 'pre_event'
+        """, (
+            content,
+            proofed_content,
+            Json(sources_meta),
+            Json({'consolidated_text': raw_scrape_data, 'corrections': corrections,
+                  'consolidated_hash': consolidated_hash(raw_scrape_data)}),
+            llm_model,
+            prompt_ver,
+            event_unit_code,
+        ))
     logger.info(f"Saved intro for {event_unit_code}")
 
 
-def process_event(event, dry_run=False):
-    """Full pipeline for a single pre-event intro."""
+class _TeaserLogger:
+    """
+    on_delta callback for the writer: logs the card-teaser paragraph as soon as
+    it is complete, while the rest of the preview is still being generated.
+    """
+
+    def __init__(self, euc):
+        self.euc = euc
+        self.text = ''
+        self.done = False
+
+    def __call__(self, text):
+        if self.done:
+            return
+        # A '\n\n' split across deltas starts at most one char before the new text
+        start = max(len(self.text) - 1, 0)
+        self.text += text
+        end = self.text.find('\n\n', start)
+        if end > 0:
+            logger.info(f"  Teaser ({self.euc}): {self.text[:end][:200]}")
+            self.done = True
+            self.text = ''
+
+
+def scrape_intro(event, dry_run=False):
+    """
+    Steps 1-2 for one pre-event intro: build queries, scrape, consolidate.
+    Returns a write job {event_unit_code, consolidated, sources_meta}, False on
+    failure, or True when there is nothing to write (dry_run, or the saved
+    intro was built from the same sources).
+    """
     from source_scraper import scrape_for_event
-    from intro_writer import write_intro
-    from intro_editor import edit_intro
 
     euc = event['event_unit_code']
     logger.info(f"\n{'='*60}")
@@ -263,9 +324,7 @@ def process_event(event, dry_run=False):
     logger.info("Step 2: Scraping preview sources...")
     update_status(euc, 'scraping')
 
-    articles = scrape_for_event(resolved)
-    if not articles:
-        articles = []
+    articles = fit_token_budget(scrape_for_event(resolved) or [])
 
     consolidated = build_preview_consolidated(resolved, articles)
     sources_meta = [{
@@ -280,11 +339,28 @@ def process_event(event, dry_run=False):
         update_status(euc, 'failed', 'No preview sources found')
         return False
 
-    # Step 3: Write intro
+    # Re-runs over unchanged sources would only reproduce the saved intro; put
+    # back the status step 2 overwrote (it may already be 'published')
+    saved_status = unchanged_intro_status(euc, consolidated)
+    if saved_status:
+        logger.info(f"  Sources unchanged since the saved intro for {euc} - skipping writer + editor")
+        update_status(euc, saved_status)
+        return True
+
+    # Step 3 (writing) happens in the caller: per event or as one Message Batch
     logger.info("Step 3: Writing preview...")
     update_status(euc, 'writing')
+    return {'event_unit_code': euc, 'consolidated': consolidated, 'sources_meta': sources_meta}
+
+
+def finish_intro(job, writer_result):
+    """Steps 4-5 for a written intro: edit, then save. Returns True if saved."""
+    from intro_editor import edit_intro
+
+    euc = job['event_unit_code']
+    consolidated = job['consolidated']
+    sources_meta = job['sources_meta']
 
-    writer_result = write_intro(consolidated)
     if not writer_result:
         logger.error(f"  Writer failed for {euc}")
         update_status(euc, 'failed', 'Writer LLM call failed')
@@ -315,12 +391,51 @@ def process_event(event, dry_run=False):
     return True
 
 
-def run_batch(target_date, mode='all', dry_run=False, limit=None):
-    """Process upcoming events for a target date."""
-    events = get_upcoming_events(target_date, mode)
+def process_event(event, dry_run=False):
+    """Full pipeline for a single pre-event intro."""
+    from intro_writer import write_intro
 
-    if limit:
-        events = events[:limit]
+    job = scrape_intro(event, dry_run)
+    if not isinstance(job, dict):
+        return job
+
+    writer_result = write_intro(job['consolidated'], on_delta=_TeaserLogger(job['event_unit_code']))
+    return finish_intro(job, writer_result)
+
+
+def process_events(events, on_start=None):
+    """
+    Run the intro pipeline for many events, EVENT_CONCURRENCY at a time, calling
+    on_start(event) as each one begins. Returns each event's process_event
+    outcome (True / False / Exception) in order. Runs with at least
+    MESSAGE_BATCH_MIN_EVENTS events scrape concurrently, then write through one
+    Message Batch (half price, no rate-limit pressure), then edit concurrently.
+    """
+    def started(step):
+        def run(evt):
+            if on_start:
+                on_start(evt)
+            return step(evt)
+        return run
+
+    if len(events) < MESSAGE_BATCH_MIN_EVENTS:
+        return asyncio.run(gather_bounded(started(process_event), events))
+
+    from commentary_batch import batch_write_intros
+
+    scraped = asyncio.run(gather_bounded(started(scrape_intro), events))
+    jobs = [job for job in scraped if isinstance(job, dict)]
+    written = batch_write_intros(jobs) if jobs else []
+    finished = asyncio.run(gather_bounded(lambda pair: finish_intro(*pair), list(zip(jobs, written))))
+
+    by_code = {job['event_unit_code']: ok for job, ok in zip(jobs, finished)}
+    return [by_code[evt['event_unit_code']] if isinstance(job, dict) else job
+            for evt, job in zip(events, scraped)]
+
+
+def run_batch(target_date, mode='all', dry_run=False, limit=None):
+    """Process upcoming events for a target date (EVENT_CONCURRENCY at a time)."""
+    events = get_upcoming_events(target_date, mode, limit)
 
     medal_count = sum(1 for e in events if e['medal_flag'])
     logger.info(f"Found {len(events)} upcoming events for {target_date} ({medal_count} medal events)")
@@ -340,16 +455,18 @@ def run_batch(target_date, mode='all', dry_run=False, limit=None):
     success = 0
     failed = 0
 
-    for evt in events:
-        try:
-            ok = process_event(evt, dry_run=dry_run)
-            if ok:
-                success += 1
-            else:
-                failed += 1
-        except Exception as e:
-            logger.error(f"Unexpected error processing {evt['event_unit_code']}: {e}")
-            update_status(evt['event_unit_code'], 'failed', str(e)[:500])
+    # Each event's scrape → write → edit overlaps with the others'; all Claude
+    # calls share rate_limiter.LIMITER across the worker threads
+    outcomes = process_events(events)
+
+    for evt, ok in zip(events, outcomes):
+        if isinstance(ok, Exception):
+            logger.error(f"Unexpected error processing {evt['event_unit_code']}: {ok}")
+            update_status(evt['event_unit_code'], 'failed', str(ok)[:500])
+            failed += 1
+        elif ok:
+            success += 1
+        else:
             failed += 1
 
     logger.info(f"\nBatch complete: {success} success, {failed} failed out of {len(events)}")
@@ -372,19 +489,16 @@ if __name__ == '__main__':
 
     if args.event_code:
         # Single event - look it up
-        conn = psycopg2.connect(**DB_CONFIG)
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT su.event_unit_code, d.name, e.name, su.event_unit_name,
-                   su.medal_flag, su.start_time, su.status
-            FROM schedule_units su
-            JOIN events e ON su.event_id = e.event_id
-            JOIN disciplines d ON e.discipline_code = d.code
-            WHERE su.event_unit_code = %s
-        """, (args.event_code,))
-        row = cur.fetchone()
-        cur.close()
-        conn.close()
+        with pooled_connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                SELECT su.event_unit_code, d.name, e.name, su.event_unit_name,
+                       su.medal_flag, su.start_time, su.status
+                FROM schedule_units su
+                JOIN events e ON su.event_id = e.event_id
+                JOIN disciplines d ON e.discipline_code = d.code
+                WHERE su.event_unit_code = %s
+            """, (args.event_code,))
+            row = cur.fetchone()
 
         if not row:
             print(f"Event not found: {args.event_code}")
@@ -9,9 +9,14 @@ load_dotenv()
 
 import os
 import json
+import hashlib
 import logging
+import psycopg2
 import anthropic
 
+from rate_limiter import stream_message
+from db_pool import pooled_connection
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -19,6 +24,12 @@ ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
 MODEL = "claude-sonnet-4-20250514"
 PROMPT_VERSION = "v1"
 
+# One client per process so every event reuses its pooled HTTPS connections
+_CLIENT = (
+    anthropic.Anthropic(api_key=ANTHROPIC_API_KEY, max_retries=0)
+    if ANTHROPIC_API_KEY and ANTHROPIC_API_KEY != 'your_key_here' else None
+)
+
 SYSTEM_PROMPT = """You are a sports journalist writing a pre-event preview for the 2026 Milan-Cortina Winter Olympics. Your audience is English-speaking fans, primarily American but with international appeal.
 
 WRITING STYLE:
@@ -52,42 +63,109 @@ USER_PROMPT_TEMPLATE = """Write a pre-event preview for the following upcoming O
 Write the preview now. Output ONLY the preview text, no headers or metadata."""
 
 
-def write_intro(consolidated_text):
+# ============================================================
+# RESPONSE CACHE (commentary_edit_cache, migrations 008 / 012)
+# ============================================================
+
+def _cache_key(consolidated_text):
+    """SHA-256 over model, prompt version, system prompt and the whitespace-normalized sources."""
+    h = hashlib.sha256()
+    for part in ('intro_write', MODEL, PROMPT_VERSION, SYSTEM_PROMPT, ' '.join(consolidated_text.split())):
+        h.update(part.encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def _cache_get(key):
+    """Cached {content, usage} for an intro, or None. Cache errors never fail a write."""
+    try:
+        with pooled_connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT output FROM commentary_edit_cache WHERE cache_key = %s", (key,))
+            row = cur.fetchone()
+    except psycopg2.Error as e:
+        logger.warning(f"  Intro cache lookup failed: {e}")
+        return None
+    if not row:
+        return None
+    return {
+        'content': row[0],
+        'usage': {'input_tokens': 0, 'output_tokens': 0, 'model': MODEL,
+                  'prompt_version': PROMPT_VERSION, 'estimated_cost': 0.0},
+        'cache_hit': True,
+    }
+
+
+def _cache_put(key, result):
+    try:
+        with pooled_connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO commentary_edit_cache (cache_key, kind, output, usage)
+                VALUES (%s, 'intro_write', %s, %s)
+                ON CONFLICT (cache_key) DO NOTHING
+            """, (key, result['content'], json.dumps(result['usage'])))
+    except psycopg2.Error as e:
+        logger.warning(f"  Intro cache store failed: {e}")
+
+
+def writer_params(consolidated_text):
+    """messages.create parameters for one preview (shared by the sync and batch paths)."""
+    return {
+        'model': MODEL,
+        'max_tokens': 1536,
+        # Identical for every event; cached once it clears the model's minimum cacheable length
+        'system': [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}],
+        'messages': [{"role": "user", "content": USER_PROMPT_TEMPLATE.format(consolidated_text=consolidated_text)}],
+    }
+
+
+def writer_result(response, price_factor=1.0):
+    """{content, usage} from a writer response; price_factor 0.5 for the Message Batches API."""
+    usage = {
+        'input_tokens': response.usage.input_tokens,
+        'output_tokens': response.usage.output_tokens,
+        'cache_read_input_tokens': response.usage.cache_read_input_tokens or 0,
+        'cache_creation_input_tokens': response.usage.cache_creation_input_tokens or 0,
+        'model': MODEL,
+        'prompt_version': PROMPT_VERSION,
+    }
+
+    # Sonnet pricing per M: $3 input, $3.75 cache write, $0.30 cache read, $15 output
+    cost = (
+        usage['input_tokens'] * 3
+        + usage['cache_creation_input_tokens'] * 3.75
+        + usage['cache_read_input_tokens'] * 0.3
+        + usage['output_tokens'] * 15
+    ) * price_factor / 1_000_000
+    usage['estimated_cost'] = round(cost, 4)
+
+    return {'content': response.content[0].text, 'usage': usage}
+
+
+def write_intro(consolidated_text, on_delta=None):
     """
     Send consolidated source material to Claude, get back pre-event intro.
-    Returns dict with content, model, token usage.
+    The response is streamed; on_delta (if given) sees each text chunk as it
+    arrives. Returns dict with content, model, token usage.
     """
-    if not ANTHROPIC_API_KEY or ANTHROPIC_API_KEY == 'your_key_here':
+    if _CLIENT is None:
         logger.error("ANTHROPIC_API_KEY not configured")
         return None
 
-    client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
-    user_prompt = USER_PROMPT_TEMPLATE.format(consolidated_text=consolidated_text)
+    key = _cache_key(consolidated_text)
+    cached = _cache_get(key)
+    if cached:
+        logger.info("  Intro writer: cache hit")
+        return cached
 
     logger.info(f"Sending to Claude ({MODEL})...")
     logger.info(f"  Input size: ~{len(consolidated_text) // 4} tokens")
 
     try:
-        response = client.messages.create(
-            model=MODEL,
-            max_tokens=1536,
-            system=SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": user_prompt}]
-        )
-
-        content = response.content[0].text
-        usage = {
-            'input_tokens': response.usage.input_tokens,
-            'output_tokens': response.usage.output_tokens,
-            'model': MODEL,
-            'prompt_version': PROMPT_VERSION,
-        }
-
-        cost = (usage['input_tokens'] * 3 + usage['output_tokens'] * 15) / 1_000_000
-        usage['estimated_cost'] = round(cost, 4)
-
-        logger.info(f"  Response: {usage['output_tokens']} tokens, ~${cost:.4f}")
-        return {'content': content, 'usage': usage}
+        response = stream_message(_CLIENT, on_delta=on_delta, **writer_params(consolidated_text))
+        result = writer_result(response)
+        logger.info(f"  Response: {result['usage']['output_tokens']} tokens, ~${result['usage']['estimated_cost']:.4f}")
+        _cache_put(key, result)
+        return result
     except Exception as e:
         logger.error(f"Claude API call failed: {e}")
         return None
@@ -5,6 +5,8 @@ Load Olympics event data for a date range
 
 from olympics_scraper import OlympicsScraper
 from datetime import datetime, timedelta
+import os
+import asyncio
 import logging
 
 logging.basicConfig(
@@ -13,31 +15,60 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def load_date_range(start_date, end_date):
-    """Load Olympics data for a date range"""
+# Day requests in flight at once (the API only serves one day per request)
+FETCH_CONCURRENCY = int(os.getenv('OLYMPICS_FETCH_CONCURRENCY', '4'))
+
+
+async def _fetch_all(scraper, dates):
+    """fetch_schedule for every date on worker threads; responses in date order"""
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def bounded(date_str):
+        async with sem:
+            return await asyncio.to_thread(scraper.fetch_schedule, date_str)
+
+    return await asyncio.gather(*(bounded(d) for d in dates))
+
+
+def load_date_range(start_date, end_date, skip_dates=()):
+    """
+    Load Olympics data for a date range. Day schedules are fetched
+    concurrently; the database writes then run day by day on the scraper's
+    single connection.
+    """
     scraper = OlympicsScraper()
 
     current = datetime.strptime(start_date, '%Y-%m-%d')
     end = datetime.strptime(end_date, '%Y-%m-%d')
 
+    dates = []
+    while current <= end:
+        date_str = current.strftime('%Y-%m-%d')
+        if date_str not in skip_dates:
+            dates.append(date_str)
+        current += timedelta(days=1)
+
+    logger.info(f"Fetching {len(dates)} days ({FETCH_CONCURRENCY} at a time)...")
+    schedules = asyncio.run(_fetch_all(scraper, dates))
+
     total_processed = 0
     total_inserted = 0
     failed_dates = []
 
-    while current <= end:
-        date_str = current.strftime('%Y-%m-%d')
+    for date_str, data in zip(dates, schedules):
         try:
-            logger.info(f"Scraping {date_str}...")
-            result = scraper.run(date_str)
-            total_processed += result.get('processed', 0)
-            total_inserted += result.get('inserted', 0)
-            logger.info(f"  ✓ {result['processed']} processed, {result['inserted']} inserted")
+            logger.info(f"Loading {date_str}...")
+            # process_day handles exactly one date (run() walks to the end of the Games)
+            result = scraper.process_day(date_str, data) or {}
+            processed = result.get('units', 0)
+            inserted = result.get('schedule_units', 0)
+            total_processed += processed
+            total_inserted += inserted
+            logger.info(f"  ✓ {processed} processed, {inserted} inserted")
         except Exception as e:
             logger.error(f"  ✗ Failed to scrape {date_str}: {e}")
             failed_dates.append(date_str)
 
-        current += timedelta(days=1)
-
     logger.info(f"\n{'='*60}")
     logger.info(f"Date range complete:")
     logger.info(f"  Total processed: {total_processed}")
@@ -53,22 +84,5 @@ def load_date_range(start_date, end_date):
     }
 
 if __name__ == '__main__':
-    # Load Feb 3-5 and Feb 7-22
-    logger.info("Loading Feb 3-5...")
-    result1 = load_date_range('2026-02-03', '2026-02-05')
-
-    logger.info("\nLoading Feb 7-22...")
-    result2 = load_date_range('2026-02-07', '2026-02-22')
-
-    # Summary
-    grand_total_processed = result1['total_processed'] + result2['total_processed']
-    grand_total_inserted = result1['total_inserted'] + result2['total_inserted']
-    all_failed = result1['failed_dates'] + result2['failed_dates']
-
-    logger.info(f"\n{'='*60}")
-    logger.info(f"GRAND TOTAL:")
-    logger.info(f"  Total processed: {grand_total_processed}")
-    logger.info(f"  Total inserted: {grand_total_inserted}")
-    if all_failed:
-        logger.warning(f"  Failed dates: {', '.join(all_failed)}")
-    logger.info(f"{'='*60}")
+    # Load Feb 3-22, except Feb 6
+    load_date_range('2026-02-03', '2026-02-22', skip_dates={'2026-02-06'})
@@ -108,199 +108,154 @@ class OlympicsScraper:
         self.conn.commit()
         cursor.close()
 
+    def _upsert_rows(self, sql, rows):
+        """
+        Run one multi-row upsert (`VALUES %s ... RETURNING (xmax = 0)`) via
+        execute_values and return (inserted, updated) counts.
+        """
+        if not rows:
+            return 0, 0
+        cursor = self.conn.cursor()
+        flags = execute_values(cursor, sql, rows, page_size=500, fetch=True)
+        self.conn.commit()
+        cursor.close()
+        inserted = sum(1 for (was_insert,) in flags if was_insert)
+        return inserted, len(flags) - inserted
+
     def upsert_disciplines(self, units):
         """Upsert disciplines"""
-        cursor = self.conn.cursor()
-        data = set()
+        # Keyed by code: one statement cannot ON CONFLICT-update the same row twice
+        data = {}
         for unit in units:
             if 'disciplineCode' in unit and 'disciplineName' in unit:
-                data.add((unit['disciplineCode'], unit['disciplineName']))
-
-        inserted = 0
-        updated = 0
-        for code, name in data:
-            cursor.execute(
-                "INSERT INTO disciplines (code, name) VALUES (%s, %s) "
-                "ON CONFLICT (code) DO UPDATE SET name = EXCLUDED.name "
-                "RETURNING (xmax = 0) as inserted",
-                (code, name)
-            )
-            if cursor.fetchone()[0]:
-                inserted += 1
-            else:
-                updated += 1
+                data[unit['disciplineCode']] = (unit['disciplineCode'], unit['disciplineName'])
 
-        self.conn.commit()
-        cursor.close()
-        return inserted, updated
+        return self._upsert_rows(
+            "INSERT INTO disciplines (code, name) VALUES %s "
+            "ON CONFLICT (code) DO UPDATE SET name = EXCLUDED.name "
+            "RETURNING (xmax = 0) as inserted",
+            list(data.values())
+        )
 
     def upsert_events(self, units):
         """Upsert events"""
-        cursor = self.conn.cursor()
-        data = set()
+        data = {}
         for unit in units:
             if all(k in unit for k in ['eventId', 'disciplineCode', 'eventName']):
-                data.add((
+                data[unit['eventId']] = (
                     unit['eventId'],
                     unit['disciplineCode'],
                     unit.get('eventName', ''),
                     unit.get('genderCode'),
                     unit.get('eventType'),
                     unit.get('eventOrder')
-                ))
-
-        inserted = 0
-        updated = 0
-        for event_id, disc_code, name, gender, event_type, event_order in data:
-            cursor.execute(
-                "INSERT INTO events (event_id, discipline_code, name, gender_code, event_type, event_order) "
-                "VALUES (%s, %s, %s, %s, %s, %s) "
-                "ON CONFLICT (event_id) DO UPDATE SET "
-                "name = EXCLUDED.name, gender_code = EXCLUDED.gender_code, event_type = EXCLUDED.event_type "
-                "RETURNING (xmax = 0) as inserted",
-                (event_id, disc_code, name, gender, event_type, event_order)
-            )
-            if cursor.fetchone()[0]:
-                inserted += 1
-            else:
-                updated += 1
+                )
 
-        self.conn.commit()
-        cursor.close()
-        return inserted, updated
+        return self._upsert_rows(
+            "INSERT INTO events (event_id, discipline_code, name, gender_code, event_type, event_order) "
+            "VALUES %s "
+            "ON CONFLICT (event_id) DO UPDATE SET "
+            "name = EXCLUDED.name, gender_code = EXCLUDED.gender_code, event_type = EXCLUDED.event_type "
+            "RETURNING (xmax = 0) as inserted",
+            list(data.values())
+        )
 
     def upsert_venues(self, units):
         """Upsert venues"""
-        cursor = self.conn.cursor()
-        data = set()
+        data = {}
         for unit in units:
             if 'venue' in unit:
-                data.add((
+                data[unit['venue']] = (
                     unit['venue'],
                     unit.get('venueDescription', ''),
                     unit.get('venueLongDescription'),
                     unit.get('location'),
                     unit.get('locationDescription'),
                     unit.get('locationLongDescription')
-                ))
-
-        inserted = 0
-        updated = 0
-        for code, name, long_name, loc_code, loc_name, loc_long_name in data:
-            cursor.execute(
-                "INSERT INTO venues (code, name, long_name, location_code, location_name, location_long_name) "
-                "VALUES (%s, %s, %s, %s, %s, %s) "
-                "ON CONFLICT (code) DO UPDATE SET name = EXCLUDED.name "
-                "RETURNING (xmax = 0) as inserted",
-                (code, name, long_name, loc_code, loc_name, loc_long_name)
-            )
-            if cursor.fetchone()[0]:
-                inserted += 1
-            else:
-                updated += 1
+                )
 
-        self.conn.commit()
-        cursor.close()
-        return inserted, updated
+        return self._upsert_rows(
+            "INSERT INTO venues (code, name, long_name, location_code, location_name, location_long_name) "
+            "VALUES %s "
+            "ON CONFLICT (code) DO UPDATE SET name = EXCLUDED.name "
+            "RETURNING (xmax = 0) as inserted",
+            list(data.values())
+        )
 
     def upsert_schedule_units(self, units):
         """Upsert schedule units"""
-        cursor = self.conn.cursor()
-        inserted = 0
-        updated = 0
-
+        data = {}
         for unit in units:
             if 'id' not in unit:
                 continue
 
             event_unit_code = unit['id'].rstrip('-')
-            cursor.execute(
-                "INSERT INTO schedule_units ("
-                "event_unit_code, event_id, event_unit_name, phase_code, phase_name, phase_type, "
-                "venue_code, olympic_day, start_time, end_time, status, medal_flag, live_flag, "
-                "schedule_item_type, session_code, group_id, unit_num, competitors_json, updated_at"
-                ") VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
-                "ON CONFLICT (event_unit_code) DO UPDATE SET "
-                "event_unit_name = EXCLUDED.event_unit_name, "
-                "phase_name = EXCLUDED.phase_name, "
-                "start_time = EXCLUDED.start_time, "
-                "end_time = EXCLUDED.end_time, "
-                "status = EXCLUDED.status, "
-                "medal_flag = EXCLUDED.medal_flag, "
-                "live_flag = EXCLUDED.live_flag, "
-                "competitors_json = EXCLUDED.competitors_json, "
-                "updated_at = EXCLUDED.updated_at "
-                "RETURNING (xmax = 0) as inserted",
-                (
-                    event_unit_code,
-                    unit.get('eventId'),
-                    unit.get('eventUnitName'),
-                    unit.get('phaseCode'),
-                    unit.get('phaseName'),
-                    unit.get('phaseType'),
-                    unit.get('venue'),
-                    unit.get('olympicDay'),
-                    unit.get('startDate'),
-                    unit.get('endDate'),
-                    unit.get('status'),
-                    unit.get('medalFlag', 0),
-                    unit.get('liveFlag', False),
-                    unit.get('scheduleItemType'),
-                    unit.get('sessionCode'),
-                    unit.get('groupId'),
-                    unit.get('unitNum'),
-                    json.dumps(unit.get('competitors', [])),
-                    unit.get('updatedAt')
-                )
+            data[event_unit_code] = (
+                event_unit_code,
+                unit.get('eventId'),
+                unit.get('eventUnitName'),
+                unit.get('phaseCode'),
+                unit.get('phaseName'),
+                unit.get('phaseType'),
+                unit.get('venue'),
+                unit.get('olympicDay'),
+                unit.get('startDate'),
+                unit.get('endDate'),
+                unit.get('status'),
+                unit.get('medalFlag', 0),
+                unit.get('liveFlag', False),
+                unit.get('scheduleItemType'),
+                unit.get('sessionCode'),
+                unit.get('groupId'),
+                unit.get('unitNum'),
+                json.dumps(unit.get('competitors', [])),
+                unit.get('updatedAt')
             )
-            if cursor.fetchone()[0]:
-                inserted += 1
-            else:
-                updated += 1
 
-        self.conn.commit()
-        cursor.close()
-        return inserted, updated
+        return self._upsert_rows(
+            "INSERT INTO schedule_units ("
+            "event_unit_code, event_id, event_unit_name, phase_code, phase_name, phase_type, "
+            "venue_code, olympic_day, start_time, end_time, status, medal_flag, live_flag, "
+            "schedule_item_type, session_code, group_id, unit_num, competitors_json, updated_at"
+            ") VALUES %s "
+            "ON CONFLICT (event_unit_code) DO UPDATE SET "
+            "event_unit_name = EXCLUDED.event_unit_name, "
+            "phase_name = EXCLUDED.phase_name, "
+            "start_time = EXCLUDED.start_time, "
+            "end_time = EXCLUDED.end_time, "
+            "status = EXCLUDED.status, "
+            "medal_flag = EXCLUDED.medal_flag, "
+            "live_flag = EXCLUDED.live_flag, "
+            "competitors_json = EXCLUDED.competitors_json, "
+            "updated_at = EXCLUDED.updated_at "
+            "RETURNING (xmax = 0) as inserted",
+            list(data.values())
+        )
 
     def upsert_competitors(self, units):
         """Upsert competitors"""
-        cursor = self.conn.cursor()
-        data = set()
+        data = {}
         for unit in units:
             for competitor in unit.get('competitors', []):
                 if all(k in competitor for k in ['code', 'noc', 'name']):
-                    data.add((
+                    data[competitor['code']] = (
                         competitor['code'],
                         competitor['noc'],
                         competitor['name'],
                         competitor.get('competitorType')
-                    ))
-
-        inserted = 0
-        updated = 0
-        for code, noc, name, comp_type in data:
-            cursor.execute(
-                "INSERT INTO competitors (code, noc, name, competitor_type) "
-                "VALUES (%s, %s, %s, %s) "
-                "ON CONFLICT (code) DO UPDATE SET name = EXCLUDED.name "
-                "RETURNING (xmax = 0) as inserted",
-                (code, noc, name, comp_type)
-            )
-            if cursor.fetchone()[0]:
-                inserted += 1
-            else:
-                updated += 1
-
-        self.conn.commit()
-        cursor.close()
-        return inserted, updated
+                    )
+
+        return self._upsert_rows(
+            "INSERT INTO competitors (code, noc, name, competitor_type) "
+            "VALUES %s "
+            "ON CONFLICT (code) DO UPDATE SET name = EXCLUDED.name "
+            "RETURNING (xmax = 0) as inserted",
+            list(data.values())
+        )
 
     def upsert_unit_competitors(self, units):
         """Upsert unit_competitors junction table"""
-        cursor = self.conn.cursor()
-        inserted = 0
-        updated = 0
-
+        data = {}
         for unit in units:
             if 'id' not in unit:
                 continue
@@ -311,28 +266,27 @@ class OlympicsScraper:
                 # Skip TBD and other placeholder codes
                 if competitor['code'] == 'TBD' or competitor['code'].upper() == 'TBD':
                     continue
-                cursor.execute(
-                    "INSERT INTO unit_competitors (event_unit_code, competitor_code, start_order) "
-                    "VALUES (%s, %s, %s) "
-                    "ON CONFLICT (event_unit_code, competitor_code) DO UPDATE SET "
-                    "start_order = EXCLUDED.start_order "
-                    "RETURNING (xmax = 0) as inserted",
-                    (event_unit_code, competitor['code'], competitor.get('order'))
+                data[(event_unit_code, competitor['code'])] = (
+                    event_unit_code, competitor['code'], competitor.get('order')
                 )
-                result = cursor.fetchone()
-                if result and result[0]:
-                    inserted += 1
 
-        self.conn.commit()
-        cursor.close()
-        return inserted, updated
+        inserted, _ = self._upsert_rows(
+            "INSERT INTO unit_competitors (event_unit_code, competitor_code, start_order) "
+            "VALUES %s "
+            "ON CONFLICT (event_unit_code, competitor_code) DO UPDATE SET "
+            "start_order = EXCLUDED.start_order "
+            "RETURNING (xmax = 0) as inserted",
+            list(data.values())
+        )
+        return inserted, 0
 
-    def process_day(self, date_str):
-        """Process a single day's data"""
+    def process_day(self, date_str, data=None):
+        """Process a single day's data (data: an already-fetched schedule response)"""
         print(f"\n=== {date_str} ===")
 
-        # Fetch data
-        data = self.fetch_schedule(date_str)
+        # Fetch data (a failed prefetch passes None and gets one more try here)
+        if data is None:
+            data = self.fetch_schedule(date_str)
         if not data:
             print(f"  No data for {date_str}")
             return None
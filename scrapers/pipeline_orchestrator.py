@@ -28,6 +28,8 @@ import logging
 import argparse
 from datetime import datetime
 
+from db_pool import pooled_connection
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
@@ -85,46 +87,36 @@ def get_pending_events(mode='all'):
 
 def update_commentary_status(event_unit_code, status, error_message=None, commentary_type='post_event'):
     """Update or insert commentary status in DB."""
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor()
-
-    # Check if row exists for this specific event_unit_code + commentary_type
-    cur.execute(
-        "SELECT id FROM commentary WHERE event_unit_code = %s AND commentary_type = %s",
-        (event_unit_code, commentary_type)
-    )
-    existing = cur.fetchone()
-
-    if existing:
-        if error_message:
-            cur.execute("""
-                UPDATE commentary SET status = %s, error_message = %s, updated_at = NOW()
-                WHERE event_unit_code = %s AND commentary_type = %s
-            """, (status, error_message, event_unit_code, commentary_type))
+    with pooled_connection() as conn, conn.cursor() as cur:
+        # Check if row exists for this specific event_unit_code + commentary_type
+        cur.execute(
+            "SELECT id FROM commentary WHERE event_unit_code = %s AND commentary_type = %s",
+            (event_unit_code, commentary_type)
+        )
+        existing = cur.fetchone()
+
+        if existing:
+            if error_message:
+                cur.execute("""
+                    UPDATE commentary SET status = %s, error_message = %s, updated_at = NOW()
+                    WHERE event_unit_code = %s AND commentary_type = %s
+                """, (status, error_message, event_unit_code, commentary_type))
+            else:
+                cur.execute("""
+                    UPDATE commentary SET status = %s, updated_at = NOW()
+                    WHERE event_unit_code = %s AND commentary_type = %s
+                """, (status, event_unit_code, commentary_type))
         else:
             cur.execute("""
-                UPDATE commentary SET status = %s, updated_at = NOW()
-                WHERE event_unit_code = %s AND commentary_type = %s
-            """, (status, event_unit_code, commentary_type))
-    else:
-        cur.execute("""
-            INSERT INTO commentary (event_unit_code, commentary_type, commentary_date,
-                                    status, created_at, updated_at)
-            VALUES (%s, %s, NOW(), %s, NOW(), NOW())
-        """, (event_unit_code, commentary_type, status))
-
-    conn.commit()
-    cur.close()
-    conn.close()
-
+                INSERT INTO commentary (event_unit_code, commentary_type, commentary_date,
+                                        status, created_at, updated_at)
+                VALUES (%s, %s, NOW(), %s, NOW(), NOW())
+            """, (event_unit_code, commentary_type, status))
 
 
 def save_commentary(event_unit_code, content, proofed_content, sources_meta,
                      raw_scrape_data, writer_usage, editor_result):
     """Save completed commentary to DB."""
-    conn = psycopg2.connect(**DB_CONFIG)
-    cur = conn.cursor()
-
     corrections = editor_result.get('corrections', '') if editor_result else ''
     llm_model = writer_usage.get('model', '') if writer_usage else ''
     prompt_ver = writer_usage.get('prompt_version', '') if writer_usage else ''
@@ -139,72 +131,71 @@ def save_commentary(event_unit_code, content, proofed_content, sources_meta,
         output_tokens = usage.get('output_tokens', 0)
         estimated_cost = usage.get('estimated_cost', 0.0)
 
-    cur.execute("""
-        UPDATE commentary SET
-            content = %s,
-            proofed_content = %s,
-            sources = %s,
-            raw_scrape_data = %s,
-            status = 'proofed',
-            llm_model = %s,
-            prompt_version = %s,
-            input_tokens = %s,
-            output_tokens = %s,
-            estimated_cost = %s,
-            updated_at = NOW()
-        WHERE event_unit_code = %s AND commentary_type = %s
-    """, (
-        content,
-        proofed_content,
-        json.dumps(sources_meta),
-        json.dumps({'consolidated_text': raw_scrape_data, 'corrections': corrections}),
-        llm_model,
-        prompt_ver,
-        input_tokens,
-        output_tokens,
-        estimated_cost,
-        event_unit_code,
-        'post_event',
-    ))
-
-    conn.commit()
-    cur.close()
-    conn.close()
+    with pooled_connection() as conn, conn.cursor() as cur:
+        cur.execute("""
+            UPDATE commentary SET
+                content = %s,
+                proofed_content = %s,
+                sources = %s,
+                raw_scrape_data = %s,
+                status = 'proofed',
+                llm_model = %s,
+                prompt_version = %s,
+                input_tokens = %s,
+                output_tokens = %s,
+                estimated_cost = %s,
+                updated_at = NOW()
+            WHERE event_unit_code = %s AND commentary_type = %s
+        """, (
+            content,
+            proofed_content,
+            json.dumps(sources_meta),
+            json.dumps({'consolidated_text': raw_scrape_data, 'corrections': corrections}),
+            llm_model,
+            prompt_ver,
+            input_tokens,
+            output_tokens,
+            estimated_cost,
+            event_unit_code,
+            'post_event',
+        ))
     logger.info(f"Saved commentary for {event_unit_code}")
 
 
-def process_event(event_unit_code, dry_run=False, commentary_type='post_event'):
-    """
-    Full pipeline for a single event:
-    resolve → scrape → write → edit → store
-    """
+def resolve_event(event_unit_code, commentary_type='post_event'):
+    """Step 1: resolve results + search queries for an event (None on failure)."""
     from source_resolver import resolve_sources
 
     logger.info(f"\n{'='*60}")
     logger.info(f"PROCESSING [{commentary_type}]: {event_unit_code}")
     logger.info(f"{'='*60}")
 
-    # Step 1: Resolve sources
     logger.info("Step 1: Resolving sources...")
     resolved = resolve_sources(event_unit_code)
     if not resolved:
         logger.error(f"Failed to resolve sources for {event_unit_code}")
         update_commentary_status(event_unit_code, 'failed', 'Source resolution failed', commentary_type)
-        return False
+        return None
 
     logger.info(f"  Event: {resolved['event_label']}")
     logger.info(f"  Queries: {len(resolved['queries'])}")
     for q in resolved['queries']:
         logger.info(f"    [{q['type']}] {q['query']}")
+    return resolved
 
-    if dry_run:
-        logger.info("DRY RUN - stopping before scrape")
-        return True
+
+def scrape_event(event_unit_code, commentary_type='post_event', resolved=None):
+    """
+    Steps 1-2: resolve → scrape.
+    Returns a job dict without 'commentary' (see write_event), or None on failure.
+    """
+    if resolved is None:
+        resolved = resolve_event(event_unit_code, commentary_type)
+        if not resolved:
+            return None
 
     # Lazy imports - only needed for actual processing
     from source_scraper import scrape_for_event, build_consolidated_file
-    from commentary_writer import write_commentary
-    from commentary_editor import edit_commentary
 
     # Step 2: Scrape
     logger.info("Step 2: Scraping sources...")
@@ -223,48 +214,104 @@ def process_event(event_unit_code, dry_run=False, commentary_type='post_event'):
 
     logger.info(f"  Got {len(articles)} articles, {len(consolidated)} chars consolidated")
 
-
-    # Step 3: Write commentary
-    logger.info("Step 3: Writing commentary...")
     update_commentary_status(event_unit_code, 'writing', commentary_type=commentary_type)
-    
-    writer_result = write_commentary(consolidated)
+    return {
+        'event_unit_code': event_unit_code,
+        'commentary_type': commentary_type,
+        'resolved_data': resolved,
+        'sources_metadata': sources_meta,
+        'consolidated_text': consolidated,
+    }
+
+
+def write_event(job, writer_result):
+    """
+    Step 3: attach a write_commentary result to a scraped job.
+    Returns the edit job for edit_commentary / batch_edit_commentary, or None if writing failed.
+    """
+    event_unit_code = job['event_unit_code']
     if not writer_result:
         logger.error(f"Commentary writing failed for {event_unit_code}")
-        update_commentary_status(event_unit_code, 'failed', 'Writer LLM call failed', commentary_type)
-        return False
+        update_commentary_status(event_unit_code, 'failed', 'Writer LLM call failed', job['commentary_type'])
+        return None
     
     content = writer_result['content']
     logger.info(f"  Written: {len(content)} chars, ${writer_result['usage']['estimated_cost']}")
 
-    # Step 4: Edit/proof
-    logger.info("Step 4: Editing (fact-check + prose polish)...")
-    
-    editor_result = edit_commentary(content, resolved, sources_meta, consolidated)
+    return dict(job, commentary=content, writer_usage=writer_result['usage'])
+
+
+def prepare_event(event_unit_code, commentary_type='post_event', resolved=None):
+    """
+    Steps 1-3: resolve → scrape → write.
+    Returns an edit job for edit_commentary / batch_edit_commentary, or None on failure.
+    """
+    from commentary_writer import write_commentary
+
+    job = scrape_event(event_unit_code, commentary_type, resolved)
+    if not job:
+        return None
+
+    # Step 3: Write commentary
+    logger.info("Step 3: Writing commentary...")
+    return write_event(job, write_commentary(job['consolidated_text']))
+
+
+def finish_event(job, editor_result):
+    """Step 5: store the edited (or, if the editor failed, unproofed) commentary."""
+    event_unit_code = job['event_unit_code']
+    content = job['commentary']
+
     if not editor_result:
         # Editor failed - save unproofed version
         logger.warning(f"Editor failed for {event_unit_code} - saving unproofed")
         save_commentary(
-            event_unit_code, content, content, sources_meta,
-            consolidated, writer_result['usage'], None
+            event_unit_code, content, content, job['sources_metadata'],
+            job['consolidated_text'], job['writer_usage'], None
         )
         return True
 
     proofed = editor_result['proofed_content']
     logger.info(f"  Corrections: {editor_result['corrections'][:100] if editor_result['corrections'] else 'None'}")
 
-    # Step 5: Store
     logger.info("Step 5: Saving to database...")
     save_commentary(
-        event_unit_code, content, proofed, sources_meta,
-        consolidated, writer_result['usage'], editor_result
+        event_unit_code, content, proofed, job['sources_metadata'],
+        job['consolidated_text'], job['writer_usage'], editor_result
     )
 
-    total_cost = writer_result['usage']['estimated_cost'] + editor_result.get('estimated_cost', 0)
+    total_cost = job['writer_usage']['estimated_cost'] + editor_result.get('estimated_cost', 0)
     logger.info(f"DONE! Total cost: ${total_cost:.4f}")
     return True
 
 
+def process_event(event_unit_code, dry_run=False, commentary_type='post_event'):
+    """
+    Full pipeline for a single event:
+    resolve → scrape → write → edit → store
+    """
+    resolved = resolve_event(event_unit_code, commentary_type)
+    if not resolved:
+        return False
+
+    if dry_run:
+        logger.info("DRY RUN - stopping before scrape")
+        return True
+
+    job = prepare_event(event_unit_code, commentary_type, resolved=resolved)
+    if not job:
+        return False
+
+    from commentary_editor import edit_commentary
+
+    # Step 4: Edit/proof
+    logger.info("Step 4: Editing (fact-check + prose polish)...")
+    editor_result = edit_commentary(
+        job['commentary'], job['resolved_data'], job['sources_metadata'], job['consolidated_text']
+    )
+    return finish_event(job, editor_result)
+
+
 def run_batch(mode='all', dry_run=False, limit=None):
     """Process multiple events."""
     events = get_pending_events(mode)
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - Proactive client-side limiter for Anthropic API calls.
+
+Tracks requests, input tokens and output tokens over a sliding 60s window plus
+the number of in-flight requests, and makes callers wait *before* sending a
+request that would exceed a limit (instead of paying a 429 + retry-after).
+
+Limits start from env defaults and are corrected from the
+anthropic-ratelimit-* response headers. Concurrency follows AIMD: halved on
+a 429, recovered by one slot per successful call. Transient failures (429,
+529, 5xx, connection errors) are retried with backoff; client errors fail fast.
+A run of consecutive 529 overloaded responses opens a circuit breaker, so the
+rest of a batch fails fast instead of queueing more retries against an API
+that is down.
+
+Usage:
+    from rate_limiter import create_message
+
+    response = create_message(client, model=..., max_tokens=..., system=..., messages=[...])
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+import anthropic
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60
+
+# AIMD: additive increase per successful call, multiplicative decrease on 429
+ALPHA = 1.0
+BETA = 0.5
+
+# Start pausing when the server reports less than this fraction remaining
+LOW_WATERMARK = 0.05
+
+# Attempts per call for transient errors (429, 529 overloaded, 5xx, connection).
+# Clients are built with max_retries=0 so these are the only retries.
+MAX_ATTEMPTS = 3
+
+# Consecutive 529s (across all callers) that open the circuit, and how long it
+# then stays open before calls are let through again
+BREAKER_THRESHOLD = int(os.getenv('ANTHROPIC_BREAKER_THRESHOLD', '10'))
+BREAKER_COOLDOWN = float(os.getenv('ANTHROPIC_BREAKER_COOLDOWN', '300'))
+
+
+def estimate_tokens(*texts):
+    """Rough token estimate (~4 chars per token) for pre-request budgeting."""
+    return sum(len(t) for t in texts if t) // 4
+
+
+class _Window:
+    """Sliding window of [timestamp, amount, live] entries."""
+
+    def __init__(self):
+        self.entries = deque()
+        self.total = 0
+
+    def prune(self, now):
+        while self.entries and now - self.entries[0][0] >= WINDOW_SECONDS:
+            entry = self.entries.popleft()
+            self.total -= entry[1]
+            entry[2] = False
+
+    def add(self, now, amount):
+        """Record amount at now; returns the entry so it can be corrected later."""
+        entry = [now, amount, True]
+        self.entries.append(entry)
+        self.total += amount
+        return entry
+
+    def set_amount(self, entry, amount):
+        """Correct an entry in place, keeping its timestamp (no-op once it has left the window)."""
+        if entry[2]:
+            self.total += amount - entry[1]
+            entry[1] = amount
+
+    def wait_time(self, now, amount, limit):
+        """Seconds until `amount` more fits under `limit` (0 if it fits now)."""
+        if self.total + amount <= limit or not self.entries:
+            return 0
+        excess = self.total + amount - limit
+        for ts, n, _ in self.entries:
+            excess -= n
+            if excess <= 0:
+                return max(ts + WINDOW_SECONDS - now, 0)
+        return WINDOW_SECONDS
+
+
+class _Slot:
+    """Handle returned by AnthropicLimiter.slot() to report actual usage."""
+
+    def __init__(self, limiter, input_entry, output_entry):
+        self._limiter = limiter
+        self._input_entry = input_entry
+        self._output_entry = output_entry
+
+    def settle(self, input_tokens, output_tokens):
+        """Replace the pre-request estimate with actual usage, at the estimate's timestamp."""
+        self._limiter._settle(self._input_entry, input_tokens, self._output_entry, output_tokens)
+
+
+class AnthropicLimiter:
+    """Thread-safe RPM / input-TPM / output-TPM / concurrency limiter."""
+
+    def __init__(self, requests_per_minute, input_tokens_per_minute,
+                 output_tokens_per_minute, max_concurrency):
+        self.rpm = requests_per_minute
+        self.itpm = input_tokens_per_minute
+        self.otpm = output_tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(max_concurrency)
+
+        self._requests = _Window()
+        self._input = _Window()
+        self._output = _Window()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    # --------------------------------------------------------
+    # Acquire / release
+    # --------------------------------------------------------
+
+    def acquire(self, input_tokens, output_tokens):
+        """
+        Block until a request with this token estimate fits every limit.
+        Returns the (input, output) window entries holding the estimate.
+        """
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                for w in (self._requests, self._input, self._output):
+                    w.prune(now)
+
+                wait = max(
+                    self._paused_until - now,
+                    self._requests.wait_time(now, 1, self.rpm),
+                    self._input.wait_time(now, input_tokens, self.itpm),
+                    self._output.wait_time(now, output_tokens, self.otpm),
+                )
+                if self._in_flight < max(int(self.concurrency), 1) and wait <= 0:
+                    self._requests.add(now, 1)
+                    self._in_flight += 1
+                    return self._input.add(now, input_tokens), self._output.add(now, output_tokens)
+
+                # Woken early by release()/update(); otherwise re-check after `wait`
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, input_tokens, output_tokens):
+        """Context manager around acquire()/release()."""
+        input_entry, output_entry = self.acquire(input_tokens, output_tokens)
+        try:
+            yield _Slot(self, input_entry, output_entry)
+        finally:
+            self.release()
+
+    def _settle(self, input_entry, input_tokens, output_entry, output_tokens):
+        with self._cond:
+            self._input.set_amount(input_entry, input_tokens)
+            self._output.set_amount(output_entry, output_tokens)
+            self._cond.notify_all()
+
+    # --------------------------------------------------------
+    # Feedback from the API
+    # --------------------------------------------------------
+
+    def update(self, headers):
+        """
+        Adopt the server's limits from anthropic-ratelimit-* headers, pause until
+        reset if any budget is nearly exhausted, and additively recover concurrency.
+        """
+        with self._cond:
+            for kind, attr in (('requests', 'rpm'),
+                               ('input-tokens', 'itpm'),
+                               ('output-tokens', 'otpm')):
+                limit = _int_header(headers, f'anthropic-ratelimit-{kind}-limit')
+                remaining = _int_header(headers, f'anthropic-ratelimit-{kind}-remaining')
+                if limit:
+                    setattr(self, attr, limit)
+                if limit and remaining is not None and remaining < limit * LOW_WATERMARK:
+                    reset = _reset_header(headers, f'anthropic-ratelimit-{kind}-reset')
+                    if reset:
+                        self._paused_until = max(self._paused_until, time.monotonic() + reset)
+                        logger.info("Rate limiter: %s nearly exhausted, pausing %.1fs", kind, reset)
+
+            self.concurrency = min(self.concurrency + ALPHA, self.max_concurrency)
+            self._cond.notify_all()
+
+    def backoff(self, retry_after=None):
+        """On a 429: halve concurrency and hold all callers for retry-after seconds."""
+        with self._cond:
+            self.concurrency = max(self.concurrency * BETA, 1.0)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            logger.warning("Rate limited: concurrency -> %d, pausing %.1fs",
+                           int(self.concurrency), retry_after or 0)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the overload breaker is open."""
+
+
+class OverloadBreaker:
+    """Opens after BREAKER_THRESHOLD consecutive 529s; any other outcome resets the count."""
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._consecutive = 0
+        self._open_until = 0.0
+
+    def check(self):
+        remaining = self._open_until - time.monotonic()
+        if remaining > 0:
+            raise CircuitOpenError(f"Anthropic API overloaded; circuit open for {remaining:.0f}s more")
+
+    def record(self, overloaded):
+        with self._lock:
+            if not overloaded:
+                self._consecutive = 0
+                return
+            self._consecutive += 1
+            if self._consecutive >= self.threshold:
+                self._open_until = time.monotonic() + self.cooldown
+                self._consecutive = 0
+                logger.error("%s consecutive overloaded responses: failing Anthropic calls fast for %.0fs",
+                             self.threshold, self.cooldown)
+
+
+def _int_header(headers, name):
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _reset_header(headers, name):
+    """Seconds until an RFC 3339 reset timestamp (None if absent/unparseable)."""
+    value = headers.get(name)
+    if not value:
+        return None
+    try:
+        reset_at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return max((reset_at - datetime.now(reset_at.tzinfo)).total_seconds(), 0)
+
+
+def retry_after_seconds(headers):
+    """Parse a retry-after header into seconds (None if absent)."""
+    value = headers.get('retry-after') if headers is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+# Shared by every Anthropic caller in this process (editor, writers, threads)
+LIMITER = AnthropicLimiter(
+    requests_per_minute=int(os.getenv('ANTHROPIC_RPM', '50')),
+    input_tokens_per_minute=int(os.getenv('ANTHROPIC_ITPM', '30000')),
+    output_tokens_per_minute=int(os.getenv('ANTHROPIC_OTPM', '8000')),
+    max_concurrency=int(os.getenv('ANTHROPIC_MAX_CONCURRENCY', '5')),
+)
+BREAKER = OverloadBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN)
+
+
+def with_retries(send):
+    """
+    Call send() up to MAX_ATTEMPTS times. Rate limits back off the shared LIMITER
+    and wait out retry-after; overloaded / 5xx / connection errors wait 2^attempt
+    seconds plus jitter. Client errors (400, 401, 404, ...) are raised at once.
+    While BREAKER is open, raises CircuitOpenError without sending.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        BREAKER.check()
+        try:
+            response = send()
+            BREAKER.record(False)
+            return response
+        except anthropic.RateLimitError as e:
+            BREAKER.record(False)
+            retry_after = retry_after_seconds(e.response.headers)
+            LIMITER.backoff(retry_after)
+            # The limiter itself now holds every caller for retry-after
+            delay = random.random() if retry_after else 2 ** attempt + random.random()
+            error = e
+        except anthropic.APIStatusError as e:
+            if e.status_code < 500:
+                raise
+            BREAKER.record(e.status_code == 529)
+            delay = 2 ** attempt + random.random()
+            error = e
+        except anthropic.APIConnectionError as e:
+            BREAKER.record(False)
+            delay = 2 ** attempt + random.random()
+            error = e
+
+        if attempt == MAX_ATTEMPTS - 1:
+            raise error
+        logger.warning("Anthropic call failed (%s), retry %s/%s in %.1fs",
+                       error.__class__.__name__, attempt + 1, MAX_ATTEMPTS - 1, delay)
+        time.sleep(delay)
+
+
+def _estimate_input(params):
+    return estimate_tokens(
+        str(params.get('system', '')), *(str(m.get('content', '')) for m in params.get('messages', []))
+    )
+
+
+def create_message(client, **params):
+    """
+    client.messages.create(**params) under LIMITER: waits for headroom, feeds the
+    response headers back, and retries transient failures (see with_retries).
+    """
+    def send():
+        with LIMITER.slot(_estimate_input(params), params.get('max_tokens', 0)) as slot:
+            raw = client.messages.with_raw_response.create(**params)
+            LIMITER.update(raw.headers)
+            response = raw.parse()
+            slot.settle(response.usage.input_tokens, response.usage.output_tokens)
+        return response
+
+    return with_retries(send)
+
+
+def stream_message(client, on_delta=None, **params):
+    """
+    Streaming counterpart of create_message: sends via client.messages.stream,
+    passes each text delta to on_delta as it arrives, and returns the final Message.
+    A retried call streams again from the start.
+    """
+    def send():
+        with LIMITER.slot(_estimate_input(params), params.get('max_tokens', 0)) as slot:
+            with client.messages.stream(**params) as stream:
+                LIMITER.update(stream.response.headers)
+                for text in stream.text_stream:
+                    if on_delta:
+                        on_delta(text)
+                response = stream.get_final_message()
+            slot.settle(response.usage.input_tokens, response.usage.output_tokens)
+        return response
+
+    return with_retries(send)
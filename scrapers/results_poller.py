@@ -50,10 +50,14 @@ def fetch_today_schedule():
         return None
 
 
-def get_existing_result_units(cur):
+def get_existing_result_units(conn):
     """Get set of event_unit_codes that already have results"""
-    cur.execute("SELECT DISTINCT event_unit_code FROM results")
-    return {row[0] for row in cur.fetchall()}
+    # Named (server-side) cursor: rows stream in itersize batches instead of
+    # the whole result set being buffered client-side before the set is built
+    with conn.cursor(name='existing_result_units') as cur:
+        cur.itersize = 1000
+        cur.execute("SELECT DISTINCT event_unit_code FROM results")
+        return {row[0] for row in cur}
 
 
 def extract_results(unit):
@@ -117,21 +121,21 @@ def run():
         logger.info("No units for today")
         return
 
+    finished = [(unit['id'].rstrip('-'), unit) for unit in units if unit.get('status') == 'FINISHED']
+    if not finished:
+        logger.info("No finished units yet")
+        return
+
     conn = psycopg2.connect(**DB_CONFIG)
     cur = conn.cursor()
 
-    existing = get_existing_result_units(cur)
+    existing = get_existing_result_units(conn)
     
     new_results = 0
     updated_units = 0
     new_events = []
 
-    for unit in units:
-        if unit.get('status') != 'FINISHED':
-            continue
-
-        event_unit_code = unit['id'].rstrip('-')
-
+    for event_unit_code, unit in finished:
         # Always update schedule_units with latest data
         update_schedule_unit(cur, unit)
         updated_units += 1
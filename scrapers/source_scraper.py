@@ -14,8 +14,10 @@ import requests
 import logging
 import time
 import re
+import asyncio
+import hashlib
 from datetime import datetime
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qsl, urlencode
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -38,6 +40,8 @@ MAX_TOTAL_ARTICLES = 12
 FETCH_TIMEOUT = 15
 # Delay between fetches to be polite
 FETCH_DELAY = 1.0
+# SerpAPI searches in flight at once for one event's queries
+SEARCH_CONCURRENCY = int(os.getenv('SERPAPI_CONCURRENCY', '4'))
 
 
 def search_serpapi(query, num_results=5):
@@ -152,6 +156,35 @@ def _fetch_article_fallback(url, domain):
 
 
 
+async def _search_all(queries):
+    """Run search_serpapi for every query on worker threads; results in query order."""
+    sem = asyncio.Semaphore(SEARCH_CONCURRENCY)
+
+    async def bounded(query_text):
+        async with sem:
+            return await asyncio.to_thread(search_serpapi, query_text)
+
+    return await asyncio.gather(*(bounded(q['query']) for q in queries))
+
+
+_TRACKING_PARAM_RE = re.compile(r'^(utm_|fbclid$|gclid$|mc_|ref$|cmpid$)', re.I)
+_WS_RE = re.compile(r'\s+')
+
+
+def _canonical_url(url):
+    """URL with scheme, www., fragment, trailing slash and tracking params removed."""
+    parts = urlparse(url)
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query)
+                       if not _TRACKING_PARAM_RE.match(k)])
+    host = parts.netloc.lower().replace('www.', '')
+    return f"{host}{parts.path.rstrip('/')}" + (f"?{query}" if query else "")
+
+
+def _content_hash(text):
+    """Digest of whitespace-collapsed, lowercased body: catches syndicated copies (AP/Reuters)."""
+    return hashlib.blake2b(_WS_RE.sub(' ', text).strip().lower().encode(), digest_size=16).digest()
+
+
 def scrape_for_event(resolved_data):
     """
     Main scraping function. Takes output from source_resolver.resolve_sources(),
@@ -165,14 +198,18 @@ def scrape_for_event(resolved_data):
 
     all_articles = []
     seen_urls = set()
+    seen_hashes = set()
     seen_domains = set()
 
-    for q in resolved_data['queries']:
-        query_text = q['query']
-        query_type = q['type']
-        logger.info(f"  Searching [{query_type}]: {query_text}")
+    # Searches are independent, so run them together; article selection below
+    # stays sequential because the caps and dedupe depend on earlier picks
+    queries = resolved_data['queries']
+    for q in queries:
+        logger.info(f"  Searching [{q['type']}]: {q['query']}")
+    search_results = asyncio.run(_search_all(queries))
 
-        results = search_serpapi(query_text)
+    for q, results in zip(queries, search_results):
+        query_type = q['type']
         articles_from_query = 0
 
         for r in results:
@@ -183,9 +220,11 @@ def scrape_for_event(resolved_data):
 
             url = r.get('link', '')
             domain = urlparse(url).netloc.replace('www.', '')
+            canonical = _canonical_url(url)
 
-            # Skip duplicates and already-seen domains (prefer diversity)
-            if url in seen_urls:
+            # Skip duplicates (the same story often comes back for several
+            # queries, with different tracking params) and already-seen domains
+            if canonical in seen_urls:
                 continue
             if domain in seen_domains:
                 # Allow max 2 articles from same domain (e.g., olympics.com)
@@ -193,13 +232,19 @@ def scrape_for_event(resolved_data):
                 if domain_count >= 2:
                     continue
 
-            seen_urls.add(url)
+            seen_urls.add(canonical)
             logger.info(f"    Fetching: {url}")
             
             time.sleep(FETCH_DELAY)
             article = fetch_article_text(url)
-            
+
             if article:
+                digest = _content_hash(article['text'])
+                if digest in seen_hashes:
+                    logger.info(f"    - Duplicate body (syndicated copy): {domain}")
+                    continue
+                seen_hashes.add(digest)
+
                 article['query_type'] = query_type
                 article['query_reason'] = q.get('reason', '')
                 article['snippet'] = r.get('snippet', '')